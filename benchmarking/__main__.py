@@ -1,28 +1,34 @@
 import argparse
 import os
 import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
-from benchmarking.utils import write_benchmarking_data
+from benchmarking.utils import (
+    migrate_stats_file,
+    read_benchmarked_files,
+    sum_constraint_counts,
+    write_benchmarking_data,
+)
 from vulcan.app import run_pipeline
 from vulcan.readers.csv import read_csv
 from vulcan.testers.column import get_missing_columns
-from vulcan.testers.constraint import count_constraints
 
 
-def run_benchmarking_pipeline(file_name, db_uri, db_type):
+def collect_benchmarking_stats(
+    file_name, db_uri, db_type, csv_engine=None, single_table=False
+):
     start_time = time.time()
-    dataframe = read_csv(file_name)
-    response = run_pipeline(dataframe, db_uri, db_type)
+    dataframe = read_csv(file_name, engine=csv_engine)
+    response = run_pipeline(
+        dataframe, db_uri, single_table=single_table, use_cache=False
+    )
     execution_time = time.time() - start_time
 
-    stats = {}
-    for query in response["queries"]:
-        query_constraints = count_constraints(query)
-        for key in set(stats) | set(query_constraints):
-            stats[key] = stats.get(key, 0) + query_constraints.get(key, 0)
+    stats = sum_constraint_counts(response.queries)
 
-    no_of_queries = len(response["queries"])
-    no_of_missing_columns = len(get_missing_columns(response["queries"], dataframe))
+    no_of_queries = len(response.queries)
+    no_of_missing_columns = len(get_missing_columns(response.queries, dataframe))
     no_total_constraints = sum(stats.values())
 
     stats.update(
@@ -34,9 +40,18 @@ def run_benchmarking_pipeline(file_name, db_uri, db_type):
             "num_tables": no_of_queries,
             "no_of_missing_columns": no_of_missing_columns,
             "masked": False,
+            "mtime_ns": os.stat(file_name).st_mtime_ns,
         }
     )
+    return stats
 
+
+def run_benchmarking_pipeline(
+    file_name, db_uri, db_type, csv_engine=None, single_table=False
+):
+    stats = collect_benchmarking_stats(
+        file_name, db_uri, db_type, csv_engine, single_table
+    )
     write_benchmarking_data(stats)
     return stats
 
@@ -44,7 +59,11 @@ def run_benchmarking_pipeline(file_name, db_uri, db_type):
 def main():
     parser = argparse.ArgumentParser(description="Process some arguments.")
     parser.add_argument(
-        "-f", "--file_name", type=str, help="File name containing SQL queries"
+        "-f",
+        "--file_name",
+        type=str,
+        nargs="+",
+        help="One or more CSV files to benchmark",
     )
     parser.add_argument(
         "--db_uri", type=str, help="Path to the database file", default=None
@@ -56,9 +75,71 @@ def main():
         help="Type of the database",
         default="postgres",
     )
+    parser.add_argument(
+        "--single_table",
+        action="store_true",
+        help="Force generation of a single table schema (default: attempts multi-table)",
+    )
+    parser.add_argument(
+        "--max_workers",
+        type=int,
+        help=(
+            "Number of CSV files benchmarked in parallel (default: 1). All runs "
+            "drop and recreate their tables in the same --db_uri, so parallel "
+            "runs whose generated table names overlap (users, orders, ...) "
+            "break each other; benchmark such CSVs in separate databases"
+        ),
+        default=1,
+    )
+    parser.add_argument(
+        "--fast_csv",
+        action="store_true",
+        help="Read input CSVs with the pyarrow parser (requires pyarrow)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-run files whose unchanged results are already in the stats file",
+    )
 
     args = parser.parse_args()
-    run_benchmarking_pipeline(args.file_name, args.db_uri, args.db_type)
+    csv_engine = "pyarrow" if args.fast_csv else None
+    csv_files = args.file_name
+    # Before any pipeline runs, so an old stats file can't fail the first write
+    migrate_stats_file()
+    if not args.force:
+        done = read_benchmarked_files()
+        csv_files = [
+            path
+            for path in csv_files
+            if (os.path.basename(path), str(os.stat(path).st_mtime_ns)) not in done
+        ]
+        if not csv_files:
+            print("All files already benchmarked; use --force to re-run.")
+            return
+    max_workers = min(len(csv_files), args.max_workers)
+
+    if max_workers <= 1:
+        for csv_path in csv_files:
+            run_benchmarking_pipeline(
+                csv_path, args.db_uri, args.db_type, csv_engine, args.single_table
+            )
+        return
+
+    # Each CSV is an independent pipeline run, but all of them share --db_uri:
+    # concurrent runs can drop each other's tables (DROP ... CASCADE on names
+    # like "users"), which is why this is opt-in. Stats are written from the
+    # main process so concurrent workers never interleave rows in the file.
+    benchmark = partial(
+        collect_benchmarking_stats,
+        db_uri=args.db_uri,
+        db_type=args.db_type,
+        csv_engine=csv_engine,
+        single_table=args.single_table,
+    )
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for stats in executor.map(benchmark, csv_files):
+            write_benchmarking_data(stats)
 
 
 if __name__ == "__main__":
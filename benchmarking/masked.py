@@ -2,11 +2,10 @@ import argparse
 import os
 import time
 
-from benchmarking.utils import write_benchmarking_data
+from benchmarking.utils import sum_constraint_counts, write_benchmarking_data
 from vulcan.app import run_pipeline
 from vulcan.readers.csv import read_csv
 from vulcan.testers.column import get_missing_columns
-from vulcan.testers.constraint import count_constraints
 
 
 def mask_column_names(dataframe):
@@ -22,19 +21,13 @@ def run_benchmarking_pipeline_with_masking(file_name, db_uri, db_type):
     # Mask column names in the dataframe
     masked_dataframe = mask_column_names(dataframe)
 
-    response = run_pipeline(masked_dataframe, db_uri, db_type)
+    response = run_pipeline(masked_dataframe, db_uri, db_type, use_cache=False)
     execution_time = time.time() - start_time
 
-    stats = {}
-    for query in response["queries"]:
-        query_constraints = count_constraints(query)
-        for key in set(stats) | set(query_constraints):
-            stats[key] = stats.get(key, 0) + query_constraints.get(key, 0)
+    stats = sum_constraint_counts(response.queries)
 
-    no_of_queries = len(response["queries"])
-    no_of_missing_columns = len(
-        get_missing_columns(response["queries"], masked_dataframe)
-    )
+    no_of_queries = len(response.queries)
+    no_of_missing_columns = len(get_missing_columns(response.queries, masked_dataframe))
     no_total_constraints = sum(stats.values())
 
     stats.update(
@@ -1,9 +1,108 @@
-import pandas as pd
+import atexit
+import csv
+import os
+import tempfile
+from collections import Counter
+
+from vulcan.testers.constraint import count_constraints
 
 STATS_FILE = "benchmarking/output/stats.csv"
+STATS_FIELDS = [
+    "primary_key",
+    "foreign_key",
+    "unique",
+    "check",
+    "not_null",
+    "default",
+    "dataset",
+    "tool",
+    "execution_time",
+    "total_num_constraints",
+    "num_tables",
+    "no_of_missing_columns",
+    "masked",
+    "mtime_ns",
+]
+
+_stats_fh = None
+_stats_writer = None
+
+
+def _close_stats_file():
+    if _stats_fh is not None:
+        _stats_fh.close()
+
+
+def migrate_stats_file():
+    """Add any STATS_FIELDS column missing from STATS_FILE's header.
+
+    Files written by older versions lack newer columns (e.g. mtime_ns), which
+    the csv writer would reject. Old rows are kept, with the new columns empty.
+    """
+    if not os.path.exists(STATS_FILE):
+        return
+    with open(STATS_FILE, newline="") as f:
+        reader = csv.DictReader(f)
+        header = reader.fieldnames
+        if header is None:
+            return
+        missing = [field for field in STATS_FIELDS if field not in header]
+        if not missing:
+            return
+        rows = list(reader)
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(STATS_FILE), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", newline="") as f:
+            writer = csv.DictWriter(
+                f, fieldnames=header + missing, restval="", extrasaction="ignore"
+            )
+            writer.writeheader()
+            writer.writerows(rows)
+        os.replace(tmp_path, STATS_FILE)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _get_stats_writer():
+    """Open STATS_FILE once per process and reuse the same csv writer."""
+    global _stats_fh, _stats_writer
+    if _stats_writer is None:
+        migrate_stats_file()
+        _stats_fh = open(STATS_FILE, "a+", newline="")
+        _stats_fh.seek(0)
+        header = next(csv.reader(_stats_fh), None)
+        _stats_writer = csv.DictWriter(
+            _stats_fh, fieldnames=header or STATS_FIELDS, restval=""
+        )
+        if header is None:
+            _stats_writer.writeheader()
+        atexit.register(_close_stats_file)
+    return _stats_writer
+
+
+def read_benchmarked_files():
+    """Return the (dataset, mtime_ns) pairs already recorded in STATS_FILE."""
+    if not os.path.exists(STATS_FILE):
+        return set()
+    with open(STATS_FILE, newline="") as f:
+        return {
+            (row["dataset"], row["mtime_ns"])
+            for row in csv.DictReader(f)
+            if row.get("mtime_ns")
+        }
 
 
 def write_benchmarking_data(data):
-    df = pd.DataFrame([data])
-    with open(STATS_FILE, "a") as f:
-        df.to_csv(f, header=f.tell() == 0, index=False)
+    writer = _get_stats_writer()
+    writer.writerow(data)
+    _stats_fh.flush()
+
+
+def sum_constraint_counts(queries):
+    """Total the per-type constraint counts of all queries in a single pass."""
+    totals = Counter()
+    for query in queries:
+        totals.update(count_constraints(query))
+    return dict(totals)
@@ -0,0 +1,55 @@
+import csv
+
+import pytest
+
+import benchmarking.utils as bu
+
+OLD_HEADER = [field for field in bu.STATS_FIELDS if field != "mtime_ns"]
+
+
+@pytest.fixture
+def stats_file(tmp_path, monkeypatch):
+    path = tmp_path / "stats.csv"
+    monkeypatch.setattr(bu, "STATS_FILE", str(path))
+    return path
+
+
+def read_rows(path):
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        return reader.fieldnames, list(reader)
+
+
+def test_migrate_stats_file_adds_missing_columns(stats_file):
+    old_row = dict.fromkeys(OLD_HEADER, "0") | {"dataset": "titanic.csv"}
+    with open(stats_file, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=OLD_HEADER)
+        writer.writeheader()
+        writer.writerow(old_row)
+
+    bu.migrate_stats_file()
+
+    header, rows = read_rows(stats_file)
+    assert header == OLD_HEADER + ["mtime_ns"]
+    assert rows == [old_row | {"mtime_ns": ""}]
+
+
+def test_migrate_stats_file_upgrades_header_only_file(stats_file):
+    stats_file.write_text(",".join(OLD_HEADER) + "\n")
+
+    bu.migrate_stats_file()
+
+    header, rows = read_rows(stats_file)
+    assert header == OLD_HEADER + ["mtime_ns"]
+    assert rows == []
+
+
+def test_migrate_stats_file_leaves_current_file_alone(stats_file):
+    content = (
+        ",".join(bu.STATS_FIELDS) + "\n" + ",".join(["1"] * len(bu.STATS_FIELDS)) + "\n"
+    )
+    stats_file.write_text(content)
+
+    bu.migrate_stats_file()
+
+    assert stats_file.read_text() == content
@@ -0,0 +1,210 @@
+import pandas as pd
+import pytest
+from sqlalchemy import MetaData, create_engine, exc, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.pool import StaticPool
+
+import vulcan.database.load as vdl
+from vulcan.database.load import push_data_in_db
+from vulcan.utils.llm_helpers import TableTraitsWithName
+
+table_order = ["artists", "tracks"]
+table_traits = [
+    TableTraitsWithName(
+        name="artists",
+        relation_to_raw="1:n",
+        one_to_n={"surrogate_pk_col": "artist_id", "natural_key_col": "artist_name"},
+    ),
+    TableTraitsWithName(
+        name="tracks",
+        relation_to_raw="1:1",
+        dependencies=[{"parent_table_name": "artists", "local_fk_col": "artist_id"}],
+    ),
+]
+
+
+@pytest.fixture(scope="function")
+def db_engine():
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE artists (artist_id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "artist_name TEXT NOT NULL UNIQUE)"
+            )
+        )
+        conn.execute(
+            text(
+                "CREATE TABLE tracks (track_id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "track_name TEXT NOT NULL UNIQUE, "
+                "streams INTEGER CHECK (streams >= 0), "
+                "artist_id INTEGER REFERENCES artists(artist_id))"
+            )
+        )
+    yield engine
+    engine.dispose()
+
+
+def test_push_data_in_db_drops_only_bad_rows(db_engine):
+    dataframe = pd.DataFrame(
+        {
+            "track_name": ["a", "b", "a", "c", "d"],
+            "streams": [1, 2, 3, -1, 5],
+            "artist_name": ["x", "y", "x", "y", "z"],
+            "unused": [0, 0, 0, 0, 0],
+        }
+    )
+
+    lookup = push_data_in_db(db_engine, dataframe, table_order, table_traits)
+
+    assert lookup["artists"]["stats"]["dropped"] == 0
+    tracks_stats = lookup["tracks"]["stats"]
+    assert tracks_stats["attempt"] == 5
+    assert tracks_stats["dropped"] == 2
+    with db_engine.connect() as conn:
+        artists = dict(
+            conn.execute(text("SELECT artist_name, artist_id FROM artists")).all()
+        )
+        tracks = conn.execute(
+            text(
+                "SELECT track_name, streams, artist_id FROM tracks ORDER BY track_name"
+            )
+        ).all()
+    assert sorted(artists) == ["x", "y", "z"]
+    assert tracks == [
+        ("a", 1, artists["x"]),
+        ("b", 2, artists["y"]),
+        ("d", 5, artists["z"]),
+    ]
+
+
+def test_push_data_in_db_rolls_back_failed_rows(db_engine):
+    with db_engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE charts (chart_id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "rank INTEGER, track_id INTEGER REFERENCES tracks(track_id))"
+            )
+        )
+    traits = table_traits + [
+        TableTraitsWithName(
+            name="charts",
+            relation_to_raw="1:1",
+            dependencies=[{"parent_table_name": "tracks", "local_fk_col": "track_id"}],
+        )
+    ]
+    dataframe = pd.DataFrame(
+        {
+            "track_name": ["a", "a", "b"],
+            "streams": [1, 2, 3],
+            "artist_name": ["x", "w", "w"],
+            "rank": [1, 2, 3],
+        }
+    )
+
+    lookup = push_data_in_db(
+        db_engine, dataframe, ["artists", "tracks", "charts"], traits
+    )
+
+    # Row 1 fails on tracks: its new artist is rolled back and charts is blocked
+    assert lookup["artists"]["stats"]["dropped"] == 1
+    assert lookup["tracks"]["stats"]["dropped"] == 1
+    assert lookup["charts"]["stats"]["dropped"] == 1
+    with db_engine.connect() as conn:
+        artists = dict(
+            conn.execute(text("SELECT artist_name, artist_id FROM artists")).all()
+        )
+        tracks = conn.execute(
+            text("SELECT track_name, artist_id FROM tracks ORDER BY track_name")
+        ).all()
+        ranks = conn.execute(text("SELECT rank FROM charts ORDER BY rank")).all()
+    assert sorted(artists) == ["w", "x"]
+    assert tracks == [("a", artists["x"]), ("b", artists["w"])]
+    assert ranks == [(1,), (3,)]
+
+
+def test_push_data_in_db_rolls_back_new_parent_of_failed_leaf(db_engine):
+    dataframe = pd.DataFrame(
+        {
+            "track_name": ["a", "b", "c"],
+            "streams": [1, 2, -1],
+            "artist_name": ["x", "x", "new"],
+        }
+    )
+
+    lookup = push_data_in_db(db_engine, dataframe, table_order, table_traits)
+
+    # Row 2 creates an artist and fails on tracks: the artist must go with it
+    assert lookup["artists"]["stats"]["dropped"] == 1
+    assert lookup["tracks"]["stats"]["dropped"] == 1
+    with db_engine.connect() as conn:
+        artists = conn.execute(text("SELECT artist_name FROM artists")).scalars()
+        tracks = conn.execute(
+            text("SELECT track_name FROM tracks ORDER BY track_name")
+        ).scalars()
+        assert list(artists) == ["x"]
+        assert list(tracks) == ["a", "b"]
+
+
+def test_natural_key_upsert_reuses_existing_pk(db_engine):
+    metadata = MetaData()
+    metadata.reflect(bind=db_engine)
+    dataframe = pd.DataFrame(
+        {"track_name": ["a"], "streams": [1], "artist_name": ["x"]}
+    )
+    info = vdl._build_table_lookup(metadata, table_order, table_traits, dataframe)[
+        "artists"
+    ]
+
+    compiled = str(info["upsert_stmt"].compile(dialect=postgresql.dialect()))
+    assert (
+        "ON CONFLICT (artist_name) DO NOTHING RETURNING artists.artist_id" in compiled
+    )
+
+    # SQLite understands the same ON CONFLICT ... RETURNING clause
+    with db_engine.begin() as conn:
+        first_pk, first_inserted = vdl._insert_natural_key_row(
+            conn, info, {"artist_name": "x"}
+        )
+        # e.g. another writer stored the key after this loader filled its cache
+        second_pk, second_inserted = vdl._insert_natural_key_row(
+            conn, info, {"artist_name": "x"}
+        )
+        count = conn.execute(text("SELECT COUNT(*) FROM artists")).scalar_one()
+    assert first_inserted and not second_inserted
+    assert second_pk == first_pk
+    assert count == 1
+
+
+class _PgError(Exception):
+    def __init__(self, pgcode):
+        super().__init__(pgcode)
+        self.pgcode = pgcode
+
+
+def test_retry_transient_retries_only_deadlocks(monkeypatch):
+    monkeypatch.setattr(vdl.time, "sleep", lambda _: None)
+    calls = []
+
+    def flaky(pgcode, failures):
+        calls.append(pgcode)
+        if len(calls) <= failures:
+            raise exc.OperationalError("INSERT", {}, _PgError(pgcode))
+        return "done"
+
+    assert vdl._retry_transient(flaky, "40P01", 2) == "done"
+    assert len(calls) == 3
+
+    calls.clear()
+    with pytest.raises(exc.OperationalError):
+        vdl._retry_transient(flaky, "08006", 1)  # connection failure
+    assert len(calls) == 1
+
+    calls.clear()
+    with pytest.raises(exc.OperationalError):
+        vdl._retry_transient(flaky, "40001", 10)
+    assert len(calls) == vdl._TRANSIENT_RETRIES
@@ -1,6 +1,10 @@
 import pytest
 
-from vulcan.parsers.graph import get_table_creation_order
+from vulcan.parsers.graph import (
+    build_tables_dict,
+    create_query_dependent_graph,
+    get_table_creation_order,
+)
 
 test_data = [
     # Simple linear dependency
@@ -35,3 +39,22 @@ def test_get_query_execution_order(dependencies, expected):
         assert result == expected or set(result) == set(
             expected
         ), f"Expected {expected} but got {result}"
+
+
+def test_build_tables_dict_matches_dependent_graph():
+    queries = [
+        'CREATE TABLE "a" ("id" INT PRIMARY KEY)',
+        'CREATE TABLE "b" ("id" INT, "a_id" INT REFERENCES "a"("id"))',
+    ]
+    tables = build_tables_dict(queries)
+    assert list(tables) == ["a", "b"]
+    assert tables["b"]["foreign_keys"] == ["a"]
+    assert create_query_dependent_graph(queries) == (
+        {"a": ["b"], "b": []},
+        tables,
+    )
+
+
+def test_build_tables_dict_uses_given_parse():
+    parsed = [{"name": "a", "columns": [], "foreign_keys": []}]
+    assert build_tables_dict(["not sql"], parsed=parsed) == {"a": parsed[0]}
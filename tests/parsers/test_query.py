@@ -1,6 +1,5 @@
 import pytest
 from pglast import parse_sql
-from mo_sql_parsing import parse
 
 from vulcan.parsers.query import (
     parse_sql_query,
@@ -168,17 +167,20 @@ test_cases = [
 ]
 
 
-@pytest.mark.parametrize("case", test_cases)
-def test_sql_parser(case):
-    output = parse_sql_query(case["query"])
+# Parsed once at import so parametrization doesn't repeat the work per test.
+_PARSED_TEST_CASES = [(case, parse_sql_query(case["query"])) for case in test_cases]
+
+
+@pytest.mark.parametrize("case,output", _PARSED_TEST_CASES)
+def test_sql_parser(case, output):
     expected_output = case["expected_output"]
     assert (
         output["name"] == expected_output["table_name"]
     ), f"Table name mismatch: {output['name']} != {expected_output['table_name']}"
-    assert set(output["columns"]) == set(
+    assert sorted(output["columns"]) == sorted(
         expected_output["columns"]
     ), f"Column mismatch: {output['columns']} != {expected_output['columns']}"
-    assert set(output["foreign_keys"]) == set(
+    assert sorted(output["foreign_keys"]) == sorted(
         expected_output["foreign_keys"]
     ), f"Foreign keys mismatch: {output['foreign_keys']} != {expected_output['foreign_keys']}"
 
@@ -220,31 +222,37 @@ helper_test_cases = [
 ]
 
 
-@pytest.mark.parametrize("case", helper_test_cases)
-def test_extract_column_names(case):
-    parsed = parse_sql(case["query"])
+@pytest.fixture(
+    scope="session",
+    params=helper_test_cases,
+    ids=lambda c: c["expected"]["column_names"][0],
+)
+def parsed_case(request):
+    case = request.param
+    return case, parse_sql(case["query"])
+
+
+def test_extract_column_names(parsed_case):
+    case, parsed = parsed_case
     columns = extract_column_names_from_parsed_query(parsed)
-    assert set(columns) == set(case["expected"]["column_names"])
+    assert sorted(columns) == sorted(case["expected"]["column_names"])
 
 
-@pytest.mark.parametrize("case", helper_test_cases)
-def test_extract_foreign_keys(case):
-    parsed = parse_sql(case["query"])
+def test_extract_foreign_keys(parsed_case):
+    case, parsed = parsed_case
     foreign_keys = extract_foreign_keys_from_parsed_query(parsed)
-    assert set(foreign_keys) == set(case["expected"]["foreign_keys"])
+    assert sorted(foreign_keys) == sorted(case["expected"]["foreign_keys"])
 
 
-@pytest.mark.parametrize("case", helper_test_cases)
-def test_extract_columns_from_parsed_query(case):
-    parsed = parse_sql(case["query"])
+def test_extract_columns_from_parsed_query(parsed_case):
+    case, parsed = parsed_case
     columns = extract_columns_from_parsed_query(parsed)
     # TODO: Add more tests
     assert len(columns) == len(case["expected"]["column_names"])
 
 
-@pytest.mark.parametrize("case", helper_test_cases)
-def test_extract_table_constraints(case):
-    parsed = parse_sql(case["query"])
+def test_extract_table_constraints(parsed_case):
+    case, parsed = parsed_case
     constraints = extract_table_constraints_from_parsed_query(parsed)
     # TODO: Add more tests
     assert isinstance(constraints, list)
@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+import openai
+import pytest
+from pydantic import BaseModel
+
+import vulcan.utils.api_helpers as vua
+
+
+class Answer(BaseModel):
+    value: int
+
+
+class _FakeCompletions:
+    """Raises ``error`` for the first model asked, then answers every call."""
+
+    def __init__(self, error):
+        self.error = error
+        self.models = []
+
+    def parse(self, *, model, **kwargs):
+        self.models.append(model)
+        if len(self.models) == 1:
+            raise self.error
+        message = SimpleNamespace(refusal=None, parsed=Answer(value=1), content=None)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    def install(error):
+        completions = _FakeCompletions(error)
+        client = SimpleNamespace(
+            beta=SimpleNamespace(chat=SimpleNamespace(completions=completions))
+        )
+        monkeypatch.setattr(vua, "get_client", lambda: client)
+        monkeypatch.setattr(vua, "_disk_cache_enabled", False)
+        monkeypatch.setattr(vua, "_response_cache", {})
+        return completions
+
+    return install
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        ValueError("refused"),
+        openai.ContentFilterFinishReasonError(),
+        openai.LengthFinishReasonError(
+            completion=SimpleNamespace(usage="completion_tokens=10")
+        ),
+    ],
+)
+def test_structured_call_falls_back_to_larger_model(fake_client, error):
+    completions = fake_client(error)
+
+    answer = vua.openai_chat_api_structured(
+        [{"role": "user", "content": "x"}],
+        model="small",
+        fallback_model="large",
+        response_format=Answer,
+    )
+
+    assert answer == Answer(value=1)
+    assert completions.models == ["small", "large"]
+
+
+def test_structured_call_without_fallback_raises(fake_client):
+    completions = fake_client(openai.ContentFilterFinishReasonError())
+
+    with pytest.raises(openai.ContentFilterFinishReasonError):
+        vua.openai_chat_api_structured(
+            [{"role": "user", "content": "x"}],
+            model="small",
+            fallback_model=None,
+            response_format=Answer,
+        )
+    assert completions.models == ["small"]
@@ -1,8 +1,5 @@
 import argparse
 
-from vulcan.app import run_pipeline
-from vulcan.readers.csv import read_csv
-
 
 def main():
     print("Running Main Vulcan")
@@ -18,6 +15,17 @@ def main():
         action="store_true",
         help="Force generation of a single table schema (default: attempts multi-table)",
     )
+    parser.add_argument(
+        "--no_cache",
+        action="store_true",
+        help="Always call the LLM instead of reusing a cached schema for this CSV",
+    )
+    parser.add_argument(
+        "--llm_cache",
+        action="store_true",
+        help="Also keep deterministic LLM answers on disk for later runs "
+        "(same as VULCAN_LLM_CACHE=1; ignored with --no_cache)",
+    )
 
     args = parser.parse_args()
     if not args.db_uri:
@@ -25,8 +33,16 @@ def main():
             "You must provide a valid --db_uri for the PostgreSQL database."
         )
 
+    # Deferred so argument errors and --help don't wait on pandas/pglast.
+    from vulcan.app import run_pipeline
+    from vulcan.readers.csv import read_csv
+    from vulcan.utils.api_helpers import set_disk_cache
+
+    if args.llm_cache:
+        set_disk_cache(True)
+
     dataframe = read_csv(args.file_name)
-    run_pipeline(dataframe, args.db_uri, args.single_table)
+    run_pipeline(dataframe, args.db_uri, args.single_table, use_cache=not args.no_cache)
 
 
 if __name__ == "__main__":
@@ -1,48 +1,136 @@
+import logging
+from typing import TYPE_CHECKING, Optional, Tuple
+
 from dotenv import load_dotenv
-import pandas as pd  # Added for type hinting if not already present elsewhere
 
-from vulcan.generators.query import generate_sql_queries
-from vulcan.parsers.graph import create_query_dependent_graph
-from vulcan.parsers.dependency import determine_table_creation_order
-from vulcan.database.core import initialize_database, execute_queries
-from vulcan.database.validator import validate_content
-from vulcan.database.load import push_data_in_db
+# pandas and the pipeline stages are imported inside the functions that use
+# them so that `python -m vulcan --help` doesn't pay for them.
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from vulcan.generators.query import GeneratedSchema
 
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Shared defaults for tables missing from the loader's lookup; never mutated.
+_NO_LOAD_INFO: dict = {}
+_NO_LOAD_STATS = {"attempt": 0, "dropped": 0}
+
+
+def summarize_load_stats(lookup: dict, table_order: list) -> "pd.DataFrame":
+    """Tabulate attempted/dropped rows per table, in creation order."""
+    import pandas as pd
+
+    stats = [
+        lookup.get(t, _NO_LOAD_INFO).get("stats", _NO_LOAD_STATS) for t in table_order
+    ]
+    load_stats = pd.DataFrame(
+        {
+            "table": table_order,
+            "attempt": [s.get("attempt", 0) for s in stats],
+            "dropped": [s.get("dropped", 0) for s in stats],
+        }
+    )
+    load_stats["dropped_pct"] = (
+        load_stats["dropped"]
+        / load_stats["attempt"].where(load_stats["attempt"] > 0)
+        * 100
+    ).fillna(0.0)
+    return load_stats
+
+
+def cached_generate_sql_queries(
+    dataframe: "pd.DataFrame", single_table: bool
+) -> Tuple["GeneratedSchema", str]:
+    """
+    generate_sql_queries, memoized on disk by the dataframe's fingerprint and
+    the generation code's.
+
+    Returns the result and its cache key. Nothing is stored here: run_pipeline
+    stores the result once its tables are created and validated, and evicts
+    it if they are not.
+    """
+    from vulcan.generators.query import (
+        GeneratedSchema,
+        generate_sql_queries,
+        generation_fingerprint,
+    )
+    from vulcan.utils.cache_helpers import dataframe_fingerprint, load_cached
+
+    key = dataframe_fingerprint(dataframe, single_table, generation_fingerprint())
+    result = load_cached(key)
+    if not isinstance(result, GeneratedSchema):  # miss, or an outdated entry
+        result = generate_sql_queries(dataframe, single_table)
+    else:
+        logger.info("Reusing cached schema %s", key)
+    return result, key
+
+
+def _forget_failed_schema(cache_key: Optional[str]) -> None:
+    """Evict a schema that failed, and the model answers it came from."""
+    from vulcan.utils.api_helpers import evict_recent_responses
+    from vulcan.utils.cache_helpers import evict_cached
+
+    if cache_key is not None:
+        evict_cached(cache_key)
+    # Otherwise the deterministic answers would rebuild the same schema
+    evict_recent_responses()
+
+
+def run_pipeline(
+    dataframe: "pd.DataFrame", db_uri: str, single_table: bool, use_cache: bool = True
+):
+    from vulcan.generators.query import generate_sql_queries
+    from vulcan.parsers.graph import build_tables_dict
+    from vulcan.parsers.query import parse_sql_query
+    from vulcan.parsers.dependency import determine_table_creation_order
+    from vulcan.database.core import initialize_database, execute_queries
+    from vulcan.database.validator import validate_content
+    from vulcan.database.load import push_data_in_db
+    from vulcan.utils.api_helpers import clear_recent_responses, set_disk_cache
+    from vulcan.utils.cache_helpers import store_cached
+
+    # --no_cache means fresh model answers, not just a fresh schema entry
+    if not use_cache:
+        set_disk_cache(False)
+    clear_recent_responses()
 
-def run_pipeline(dataframe: pd.DataFrame, db_uri: str, single_table: bool):
     # Generate Schema, Constraints, and Queries
     # The generate_sql_queries function now handles more, based on query.py changes
-    data_dict = generate_sql_queries(dataframe, single_table)
+    cache_key: Optional[str] = None
+    if use_cache:
+        result, cache_key = cached_generate_sql_queries(dataframe, single_table)
+    else:
+        result = generate_sql_queries(dataframe, single_table)
 
-    queries = data_dict["queries"]
-    if "table_traits" not in data_dict or "table_list" not in data_dict:
-        raise ValueError("table_traits or table_list is missing in data_dict")
-    table_traits = data_dict["table_traits"]
-    table_list = data_dict["table_list"]
+    queries = result.queries
+    table_traits = result.table_traits
+    table_list = result.table_list
 
-    # Create the dependent graph (still useful for getting the 'tables' dictionary structure)
-    dependent_graph, tables_dict_from_graph = create_query_dependent_graph(queries)
-    print(">> Dependent Graph:", dependent_graph)
-    print(">> Tables Dict from Graph:", tables_dict_from_graph)
+    # Only the per-table query info is needed; creation order comes from the traits
+    parsed_queries = [parse_sql_query(query) for query in queries]
+    tables_dict_from_graph = build_tables_dict(queries, parsed=parsed_queries)
+    logger.debug(">> Tables Dict from Graph: %s", tables_dict_from_graph)
 
     # Determine table creation order
     # This now uses table_traits and table_list as per the notebook
     table_order = determine_table_creation_order(table_traits, table_list)
-    print(">> Determined Table Order:", table_order)
+    logger.debug(">> Determined Table Order: %s", table_order)
 
     # Initialize the database engine
     engine = initialize_database(db_uri=db_uri)
 
     # Create tables by executing the CREATE statements in the correct order
-    # The 'tables' variable for execute_queries should come from create_query_dependent_graph
+    # The 'tables' variable for execute_queries should come from build_tables_dict
     success, error = execute_queries(
         engine, table_order, tables_dict_from_graph
     )  # Ensure 'tables' is correctly sourced
     if not success:
         print(f"Table creation error: {error}")
+        _forget_failed_schema(cache_key)  # a rerun must not replay it
         # Decide how to handle this error, e.g., raise an exception or return
         raise Exception(f"Table creation failed: {error}")
     else:
@@ -54,24 +142,20 @@ def run_pipeline(dataframe: pd.DataFrame, db_uri: str, single_table: bool):
         print("Schema validation passed!")
     except ValueError as e:
         print(f"Schema validation failed: {e}")
+        _forget_failed_schema(cache_key)
         raise e  # Re-raise the exception to halt pipeline if validation fails
 
+    # Only a schema that created and validated cleanly is worth reusing
+    if cache_key is not None:
+        store_cached(cache_key, result)
+
     # Populate Tables with CSV Data
     lookup = push_data_in_db(engine, dataframe, table_order, table_traits)
     print("Data insertion complete!")
 
-    total_rows = len(dataframe)
-    for tbl_name in table_order:
-        s = lookup.get(tbl_name, {}).get(
-            "stats", {"attempt": 0, "dropped": 0}
-        )  # Defensive get
-        attempt = s.get("attempt", 0)
-        dropped = s.get("dropped", 0)
-        dropped_pct = (dropped / attempt) * 100 if attempt else 0
-        print(
-            f"{tbl_name}: dropped {dropped}/{attempt} rows ({dropped_pct:.1f}%) during load"
-        )
-
-    # The original app.py returned 'response' which was data_dict.
-    # The notebook doesn't explicitly return from its main flow, but data_dict holds all generated info.
-    return data_dict
+    load_stats = summarize_load_stats(lookup, table_order)
+    print(load_stats.to_string(index=False))
+    result.load_stats = load_stats
+
+    # result holds everything generated for the dataframe, plus the load summary.
+    return result
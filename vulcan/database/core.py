@@ -1,8 +1,9 @@
-from typing import Optional, Tuple
+import os
+from typing import List, Optional, Tuple
 
 from pandas import DataFrame
 from sqlalchemy import MetaData, create_engine, text
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine, make_url
 from sqlalchemy.exc import SQLAlchemyError
 
 from vulcan.database.load import push_data_in_db
@@ -18,6 +19,9 @@ def initialize_postgres_database(
     - db_uri: PostgreSQL database URI for connection.
     - connect_args: Optional dictionary of connection arguments to be passed to the database.
     - engine_kwargs: Additional keyword arguments to be passed to create_engine.
+      Pool settings default to pool_size=10, max_overflow=20, pool_pre_ping=True,
+      pool_recycle=1800, and executemany batching is enabled (values_plus_batch
+      on psycopg2).
 
     Returns:
     - SQLAlchemy Engine instance for the PostgreSQL database.
@@ -27,7 +31,21 @@ def initialize_postgres_database(
         raise ValueError("Invalid URI: db_uri must start with 'postgresql://'")
     if connect_args is None:
         connect_args = {}
-    return create_engine(db_uri, echo=True, connect_args=connect_args, **engine_kwargs)
+    # Keep a warm pool so the loader, validator and callers share connections
+    # instead of paying a TCP + auth handshake for every checkout.
+    engine_kwargs.setdefault("pool_size", 10)
+    engine_kwargs.setdefault("max_overflow", 20)
+    engine_kwargs.setdefault("pool_pre_ping", True)
+    # Replace connections before server/proxy idle timeouts can drop them mid-load
+    engine_kwargs.setdefault("pool_recycle", 1800)
+    # Multi-row INSERT pages for the loader's executemany batches
+    engine_kwargs.setdefault("insertmanyvalues_page_size", 1000)
+    if make_url(db_uri).get_driver_name() == "psycopg2":
+        engine_kwargs.setdefault("executemany_mode", "values_plus_batch")
+        engine_kwargs.setdefault("executemany_batch_page_size", 500)
+    # Statement logging reprs every parameter set; opt in with VULCAN_SQL_ECHO=1
+    engine_kwargs.setdefault("echo", os.getenv("VULCAN_SQL_ECHO") == "1")
+    return create_engine(db_uri, connect_args=connect_args, **engine_kwargs)
 
 
 def initialize_database(
@@ -49,12 +67,29 @@ def initialize_database(
     return initialize_postgres_database(db_uri, connect_args, **engine_kwargs)
 
 
+def _run_ddl(conn: Connection, statements: List[str]) -> None:
+    """Runs DDL statements on conn, in a single round-trip where supported."""
+    if conn.dialect.name == "postgresql" and len(statements) > 1:
+        # psycopg2 sends a multi-statement string as one simple query. With no
+        # parameters the driver must not treat % (e.g. in LIKE '%@%') as a
+        # placeholder, which exec_driver_sql alone doesn't guarantee
+        script = ";\n".join(stmt.strip().rstrip(";") for stmt in statements)
+        conn.execution_options(no_parameters=True).exec_driver_sql(script)
+    else:
+        for stmt in statements:
+            conn.execute(text(stmt))
+
+
 def execute_queries(
     engine: Engine, table_order: list[str], tables: dict
 ) -> Tuple[bool, Optional[str]]:
     """
     Executes a list of SQL queries using the given engine.
 
+    On PostgreSQL the drops and creates are sent as one multi-statement batch. If
+    the batch fails it is retried statement by statement, so the returned error
+    names the failing query.
+
     Parameters:
     - engine: SQLAlchemy Engine instance.
     - queries: List of SQL query strings to be executed.
@@ -62,23 +97,37 @@ def execute_queries(
     Returns:
     - Tuple of success flag and error message (if any).
     """
+    # reversing to drop in dependency order
+    drop_statements = [
+        f'DROP TABLE IF EXISTS "{table_name}" CASCADE'
+        for table_name in reversed(table_order)
+    ]
+    create_statements = [tables[table_name]["query"] for table_name in table_order]
+    statements = drop_statements + create_statements
+
     with engine.connect() as conn:
         transaction = conn.begin()
         try:
-            # drop tables if they exist in database
-            for table_name in reversed(
-                table_order
-            ):  # reversing to drop in dependency order
-                conn.execute(text(f'DROP TABLE IF EXISTS "{table_name}" CASCADE'))
-                print(f"Table {table_name} dropped")
-            for table_name in table_order:
-                query = tables[table_name]["query"]
-                conn.execute(text(query))
+            _run_ddl(conn, statements)
             transaction.commit()
-            return True, None
-        except SQLAlchemyError as e:
+        # Driver-side formatting errors surface as TypeError/ValueError rather
+        # than SQLAlchemyError; the per-statement pass reports them properly
+        except (SQLAlchemyError, TypeError, ValueError) as e:
             transaction.rollback()
-            return False, str(e)
+            if conn.dialect.name != "postgresql":
+                return False, str(e)
+            # Locate the offending statement with per-statement execution
+            transaction = conn.begin()
+            try:
+                for stmt in statements:
+                    conn.execute(text(stmt))
+                transaction.commit()
+            except (SQLAlchemyError, TypeError, ValueError) as e:
+                transaction.rollback()
+                return False, str(e)
+    for table_name in reversed(table_order):
+        print(f"Table {table_name} dropped")
+    return True, None
 
 
 def reset_database(engine: Engine):
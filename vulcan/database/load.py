@@ -1,7 +1,18 @@
+import random
 import re
-from typing import Dict, List, Any, Optional
+import time
+from typing import Dict, List, Any, Optional, Tuple
 import pandas as pd
-from sqlalchemy import MetaData, Table, UniqueConstraint, select, text, exc
+from sqlalchemy import (
+    MetaData,
+    Table,
+    UniqueConstraint,
+    bindparam,
+    select,
+    text,
+    exc,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.engine import Connection, Engine
 import logging
 import pprint
@@ -37,6 +48,167 @@ def _classify_error(msg: str) -> str:
     return "unknown"
 
 
+# Rows per executemany for tables whose inserts are deferred (see push_data_in_db)
+_INSERT_BATCH_SIZE = 1000
+# Rows committed together by push_data_in_db; failed rows roll back to a savepoint
+_ROWS_PER_TRANSACTION = 1000
+# Deadlock detected / serialization failure: the statement itself was fine and
+# succeeds when run again once the competing transaction is out of the way.
+_TRANSIENT_PGCODES = frozenset({"40P01", "40001"})
+_TRANSIENT_RETRIES = 5
+_RETRY_BASE_DELAY = 0.05  # seconds; doubled per attempt, full jitter
+
+
+def _is_transient(e: exc.OperationalError) -> bool:
+    return getattr(e.orig, "pgcode", None) in _TRANSIENT_PGCODES
+
+
+def _retry_transient(fn, *args):
+    """Call ``fn(*args)``, retrying deadlocks and serialization failures.
+
+    ``fn`` must leave no trace when it raises, so it can simply be called
+    again. Sleeps a random time in [0, base * 2**attempt) between attempts.
+    """
+    for attempt in range(_TRANSIENT_RETRIES):
+        try:
+            return fn(*args)
+        except exc.OperationalError as e:
+            if not _is_transient(e) or attempt == _TRANSIENT_RETRIES - 1:
+                raise
+            delay = random.uniform(0, _RETRY_BASE_DELAY * 2**attempt)
+            logger.warning(
+                f"{e.orig.pgcode} in {fn.__name__}, retrying in {delay:.3f}s"
+            )
+            time.sleep(delay)
+
+
+def _record_drop(
+    stats: Dict[str, Any],
+    key: str,
+    row_idx: int,
+    insert_data: Dict[str, Any],
+    msg: str,
+    is_block: bool = False,
+) -> None:
+    """Count a dropped row against ``stats`` and keep a few samples per error key."""
+    # If this was a *blocked* table it never reached the
+    # "attempt += 1" line, so compensate here.
+    if is_block:
+        stats["attempt"] += 1
+    stats["dropped"] += 1
+    bucket = stats["errors"].setdefault(key, {"count": 0, "sample": []})
+    bucket["count"] += 1
+    if len(bucket["sample"]) < 3:
+        bucket["sample"].append(
+            {
+                "row_idx": row_idx,
+                "data_excerpt": str(insert_data)[:200],
+                "msg": msg[:300],
+            }
+        )
+
+
+def _execute_in_savepoint(connection: Connection, stmt, params) -> None:
+    with connection.begin_nested():
+        connection.execute(stmt, params)
+
+
+def _insert_batch(
+    connection: Connection,
+    info: Dict[str, Any],
+    batch: List[Tuple[int, Dict[str, Any]]],
+) -> None:
+    """Insert ``(row_idx, insert_data)`` pairs with a single executemany.
+
+    A failing batch is split in half and retried, each half in its own
+    savepoint, so only the offending rows are dropped.
+    """
+    try:
+        _retry_transient(
+            _execute_in_savepoint,
+            connection,
+            info["insert_stmt"],
+            [data for _, data in batch],
+        )
+    except (exc.IntegrityError, exc.DataError) as e:
+        if len(batch) > 1:
+            mid = len(batch) // 2
+            _insert_batch(connection, info, batch[:mid])
+            _insert_batch(connection, info, batch[mid:])
+            return
+        row_idx, insert_data = batch[0]
+        err_msg = str(e.orig)
+        key = _classify_error(err_msg)
+        _record_drop(info["stats"], key, row_idx, insert_data, err_msg)
+        logger.warning(
+            f"Row {row_idx}: {key} inserting into {info['table_obj'].name}: "
+            f"{err_msg}; dropped"
+        )
+
+
+def _flush_deferred(
+    connection: Connection,
+    lookup: Dict[str, Dict[str, Any]],
+    pending: Dict[str, List[Tuple[int, Dict[str, Any]]]],
+    min_size: int = 1,
+) -> None:
+    """Insert every deferred batch holding at least ``min_size`` rows.
+
+    Runs inside the caller's transaction; failures are contained by the
+    savepoints in _insert_batch.
+    """
+    for tbl_name, batch in pending.items():
+        if len(batch) >= min_size:
+            _insert_batch(connection, lookup[tbl_name], batch)
+            batch.clear()
+
+
+def _begin_load_transaction(connection: Connection):
+    """Begin one of the loader's chunk transactions.
+
+    On PostgreSQL the transaction commits without waiting for its WAL flush: a
+    crash can lose the most recent chunks but never leaves them half-applied.
+    """
+    transaction = connection.begin()
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("SET LOCAL synchronous_commit = OFF"))
+    return transaction
+
+
+def _insert_natural_key_row(
+    connection: Connection, info: Dict[str, Any], insert_data: Dict[str, Any]
+) -> Tuple[Any, bool]:
+    """Insert a 1:n row with ON CONFLICT DO NOTHING.
+
+    If another writer already stored the natural key, the existing key is
+    selected instead of raising an IntegrityError.
+
+    Returns the row's primary key and whether this call inserted it.
+    """
+    new_pk = connection.execute(info["upsert_stmt"], insert_data).scalar()
+    if new_pk is not None:
+        return new_pk, True
+    existing_pk = connection.execute(
+        info["pk_by_natural_key_stmt"],
+        {"natural_key": insert_data[info["natural_key_col"]]},
+    ).scalar_one()
+    return existing_pk, False
+
+
+def _has_unique_constraint(table: Table, col_name: str) -> bool:
+    """True if ``col_name`` alone is covered by a unique constraint or index."""
+    if table.c[col_name].unique or table.c[col_name].primary_key:
+        return True
+    for constraint in table.constraints:
+        if isinstance(constraint, UniqueConstraint) and constraint.columns.keys() == [
+            col_name
+        ]:
+            return True
+    return any(
+        index.unique and index.columns.keys() == [col_name] for index in table.indexes
+    )
+
+
 def _build_table_lookup(
     metadata: MetaData,
     table_order: List[str],
@@ -52,12 +224,26 @@ def _build_table_lookup(
         * ``col_map`` - ``Dict[db_col_name -> csv_col_name or None]``
           (``None`` means the value does not originate directly from the CSV,
           e.g. surrogate IDs or FK placeholders)
+        * ``insert_cols`` - ``List[(db_col_name, csv_col_name or None)]`` columns
+          set on insert, i.e. ``col_map`` without the surrogate primary keys
+        * ``fk_plan`` - ``List[(db_col_name, parent_table_name)]`` FK columns to
+          fill from the parent's primary key generated for the same row
         * ``pk_cols`` - ``List[Column]`` primary-key columns (usually 1 item)
         * ``natural_key_col`` - ``Optional[str]`` natural-key column name for
           *1:n* tables (empty for *1:1* tables)
+        * ``natural_key_unique`` - ``bool`` whether the natural key has its own
+          unique constraint, so it can be used as an ON CONFLICT target
+        * ``insert_stmt`` - reusable ``INSERT`` for the table; tables with
+          ``natural_key_unique`` also get ``upsert_stmt`` (ON CONFLICT DO
+          NOTHING RETURNING pk) and ``pk_by_natural_key_stmt``
+
+    push_data_in_db adds ``insert_positions``, ``insert_cols`` with each CSV
+    column name replaced by its position in the row tuples it iterates.
     """
 
     traits_lookup = {t.name: t for t in table_traits}
+    # Hash lookups instead of scanning the column Index once per table column
+    df_cols = frozenset(dataframe.columns)
 
     lookup: Dict[str, Dict[str, Any]] = {}
 
@@ -83,12 +269,29 @@ def _build_table_lookup(
 
             # Prefer explicit mapping if present, else assume identical names
             csv_col = explicit_map.get(col.name, col.name)
-            if csv_col not in dataframe.columns:
+            if csv_col not in df_cols:
                 # Column comes from FK or is synthesised – mark as None so we
                 # know it must be populated programmatically later.
                 csv_col = None
             col_map[col.name] = csv_col
 
+        # Columns written on every insert. A column with no CSV source is
+        # either a surrogate PK (omitted; the database generates it) or an FK
+        # placeholder (starts as None and is filled from the parent's new PK).
+        pk_col_names = {pk_col.name for pk_col in tbl_obj.primary_key.columns}
+        insert_cols = [
+            (db_col, csv_col)
+            for db_col, csv_col in col_map.items()
+            if csv_col is not None or db_col not in pk_col_names
+        ]
+
+        # FK columns paired with the parent table whose PK they take
+        fk_plan = [
+            (col.name, next(iter(col.foreign_keys)).column.table.name)
+            for col in tbl_obj.columns
+            if col.foreign_keys
+        ]
+
         # Identify natural-key column for 1:n tables (used to de-duplicate)
         natural_key_col: Optional[str] = None
         if traits.relation_to_raw == "1:n" and traits.one_to_n:
@@ -102,12 +305,33 @@ def _build_table_lookup(
                 f"Table {tbl_name} has 1:n relation but no natural-key column defined"
             )
 
+        natural_key_unique = natural_key_col is not None and _has_unique_constraint(
+            tbl_obj, natural_key_col
+        )
+        # Statements are built once per table and executed with per-row params,
+        # so SQLAlchemy's compiled cache serves every row after the first.
+        statements: Dict[str, Any] = {"insert_stmt": tbl_obj.insert()}
+        if natural_key_unique:
+            pk_col = tbl_obj.primary_key.columns[0]
+            statements["upsert_stmt"] = (
+                pg_insert(tbl_obj)
+                .on_conflict_do_nothing(index_elements=[natural_key_col])
+                .returning(pk_col)
+            )
+            statements["pk_by_natural_key_stmt"] = select(pk_col).where(
+                tbl_obj.c[natural_key_col] == bindparam("natural_key")
+            )
+
         lookup[tbl_name] = {
             "table_obj": tbl_obj,
             "traits": traits,
             "col_map": col_map,
+            "insert_cols": insert_cols,
+            "fk_plan": fk_plan,
             "pk_cols": list(tbl_obj.primary_key.columns),
             "natural_key_col": natural_key_col,
+            "natural_key_unique": natural_key_unique,
+            **statements,
             "cache": {},  # filled in later for 1:n
             "stats": {
                 "attempt": 0,
@@ -119,172 +343,287 @@ def _build_table_lookup(
     return lookup
 
 
+def _insert_row(
+    connection: Connection,
+    lookup: Dict[str, Dict[str, Any]],
+    table_order: List[str],
+    pending: Dict[str, List[Tuple[int, Dict[str, Any]]]],
+    row: Tuple[Any, ...],
+    idx: int,
+    use_on_conflict: bool,
+) -> None:
+    """Insert one CSV row into every table of ``table_order``, atomically.
+
+    The row runs in its own savepoint. Data errors drop the row (recorded in
+    the stats); any other error leaves caches, queues and stats as they were
+    before the call and is re-raised, so the row can simply be retried.
+
+    The one exception to the savepoint is a row whose only write is to the
+    deferred leaf table: that insert is queued in ``pending`` and sent later
+    by _flush_deferred. As the row writes nothing else, it is still all or
+    nothing.
+    """
+    per_row_pk_memory: Dict[str, Any] = {}  # saves newly generated PKs for this row
+    row_writes: List[str] = []  # tables this row inserted into or queued for
+    new_cache_keys: List[Tuple[Dict[Any, Any], Any]] = []
+    failed_tbl: Optional[str] = None
+
+    # Counters as they were before this row, restored if the row must be retried
+    stats_before = [
+        (info["stats"], info["stats"]["attempt"], info["stats"]["dropped"])
+        for info in lookup.values()
+    ]
+
+    savepoint = connection.begin_nested()
+    try:
+        for tbl_name in table_order:
+            info = lookup[tbl_name]
+            traits = info["traits"]
+            stats = info["stats"]
+            stats["attempt"] += 1
+
+            # gather insert_data ------------------------------------------------
+            insert_data: Dict[str, Any] = {
+                db_col: None if pos is None else row[pos]
+                for db_col, pos in info["insert_positions"]
+            }
+
+            # resolve FKs from previously inserted parents ---------------------
+            for col_name, parent_tbl in info["fk_plan"]:
+                if parent_tbl in per_row_pk_memory:
+                    insert_data[col_name] = per_row_pk_memory[parent_tbl]
+
+            # 1:n handling ------------------------------------------------------
+            if traits.relation_to_raw == "1:n":
+                nk_col = info["natural_key_col"]
+                nk_val = insert_data[nk_col]
+                if nk_val is None:
+                    logger.warning(
+                        f"Row {idx}: missing natural‑key value for table {tbl_name}; dropped"
+                    )
+                    info["stats"]["dropped"] += 1
+                    continue
+
+                cache = info["cache"]
+                if nk_val in cache:
+                    # row already exists – reuse PK and store for dependents
+                    per_row_pk_memory[tbl_name] = cache[nk_val]
+                    continue  # nothing to insert
+
+            # Only a row whose sole write is this insert may be deferred: if
+            # the batch later drops it, nothing else of the row is left behind
+            if tbl_name in pending and not row_writes:
+                pending[tbl_name].append((idx, insert_data))
+                row_writes.append(tbl_name)
+                continue
+
+            # attempt insert ----------------------------------------------------
+            try:
+                if use_on_conflict and info["natural_key_unique"]:
+                    new_pk, inserted = _insert_natural_key_row(
+                        connection, info, insert_data
+                    )
+                    cache[nk_val] = new_pk
+                    new_cache_keys.append((cache, nk_val))
+                    per_row_pk_memory[tbl_name] = new_pk
+                    if inserted:
+                        row_writes.append(tbl_name)
+                    continue
+
+                result = connection.execute(info["insert_stmt"], insert_data)
+                row_writes.append(tbl_name)
+                if traits.relation_to_raw == "1:n":
+                    if (
+                        result.inserted_primary_key
+                        and len(result.inserted_primary_key) > 0
+                    ):
+                        new_pk = result.inserted_primary_key[0]
+                        cache[nk_val] = new_pk
+                        new_cache_keys.append((cache, nk_val))
+                        per_row_pk_memory[tbl_name] = new_pk
+                    else:
+                        # Handle case where inserted_primary_key is None or empty,
+                        raise ValueError(
+                            f"Row {idx}: Could not retrieve primary key after inserting into 1:n table {tbl_name}."
+                        )
+                elif (
+                    result.inserted_primary_key and len(result.inserted_primary_key) > 0
+                ):
+                    per_row_pk_memory[tbl_name] = result.inserted_primary_key[0]
+            except (exc.IntegrityError, exc.DataError) as e:
+                err_msg = str(e.orig)
+                parent_key = _classify_error(err_msg)
+                failed_tbl = tbl_name
+
+                # record parent failure
+                _record_drop(stats, parent_key, idx, insert_data, err_msg)
+
+                # since all tables after this one are blocked, we record the failure for all of them
+                for dep_tbl in table_order[table_order.index(tbl_name) + 1 :]:
+                    blocked_key = f"blocked-by-{tbl_name}"
+                    _record_drop(
+                        lookup[dep_tbl]["stats"],
+                        blocked_key,
+                        idx,
+                        insert_data,
+                        f"blocked because {tbl_name} failed ({parent_key})",
+                        is_block=True,
+                    )
+
+                logger.warning(
+                    f"Row {idx}: {parent_key} inserting into {tbl_name}: "
+                    f"{err_msg}; dropped and blocked dependants"
+                )
+                break
+    except BaseException:
+        savepoint.rollback()
+        for cache, nk_val in new_cache_keys:
+            cache.pop(nk_val, None)
+        for tbl_name in row_writes:
+            if tbl_name in pending:
+                pending[tbl_name].pop()
+        for stats, attempt, dropped in stats_before:
+            stats["attempt"], stats["dropped"] = attempt, dropped
+        raise
+
+    if failed_tbl is None:
+        savepoint.commit()
+    else:
+        # The savepoint takes this row's earlier inserts with it, so
+        # forget the keys they cached, unqueue its deferred rows and
+        # count those tables as dropped too.
+        savepoint.rollback()
+        for cache, nk_val in new_cache_keys:
+            cache.pop(nk_val, None)
+        for tbl_name in row_writes:
+            if tbl_name in pending:
+                pending[tbl_name].pop()
+            _record_drop(
+                lookup[tbl_name]["stats"],
+                f"rolled-back-with-{failed_tbl}",
+                idx,
+                {},
+                f"rolled back because {failed_tbl} failed",
+            )
+
+
 def push_data_in_db(
     engine: Engine,
     dataframe: pd.DataFrame,
     table_order: List[str],
     table_traits: List[TableTraitsWithName],
+    metadata: Optional[MetaData] = None,
 ) -> Dict[str, Dict[str, Any]]:
-    metadata = MetaData()
-    metadata.reflect(bind=engine)
-    # connection = engine.connect()
+    """Insert every CSV row into the tables of ``table_order``.
+
+    ``metadata`` may carry tables the caller has already reflected. Any table
+    in ``table_order`` it lacks is reflected here; nothing else is.
+    """
+    if metadata is None:
+        metadata = MetaData()
+    missing = [t for t in table_order if t not in metadata.tables]
+    if missing:
+        metadata.reflect(bind=engine, only=missing)
 
     # Step 1: Prepare look-up information
     lookup = _build_table_lookup(metadata, table_order, table_traits, dataframe)
 
-    pprint.pprint(lookup)
-
-    # Step 2: Initialize 1:n caches (natural-key -> primary-key)
-    with engine.connect() as tmp_connection:
-        for tbl_name, info in lookup.items():
-            is_one_to_n = info["traits"].relation_to_raw == "1:n"
-            if not is_one_to_n:
-                continue
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Table lookup: %s", pprint.pformat(lookup))
+
+    # Only carry the CSV columns some table actually maps, so the per-row
+    # conversion below doesn't materialise unused values.
+    used_csv_cols = {
+        csv_col
+        for info in lookup.values()
+        for csv_col in info["col_map"].values()
+        if csv_col is not None
+    }
+    dataframe = dataframe.loc[:, [c for c in dataframe.columns if c in used_csv_cols]]
+
+    # One connection for the whole load, so rows don't pay a pool checkout
+    # (and pre-ping) each.
+    with engine.connect() as connection:
+        # Step 2: Initialize 1:n caches (natural-key -> primary-key)
+        with connection.begin():
+            for tbl_name, info in lookup.items():
+                is_one_to_n = info["traits"].relation_to_raw == "1:n"
+                if not is_one_to_n:
+                    continue
+
+                nk_col = info[
+                    "natural_key_col"
+                ]  # only/all 1:n table should have this populated
+                cache: Dict[Any, Any] = {}
+                if nk_col:
+                    table = info["table_obj"]
+                    pk_cols = info["pk_cols"]
+                    if len(pk_cols) != 1:
+                        raise ValueError(
+                            f"Table {tbl_name} has {len(pk_cols)} primary key columns; only single-column PKs are supported"
+                        )
 
-            nk_col = info[
-                "natural_key_col"
-            ]  # only/all 1:n table should have this populated
-            cache: Dict[Any, Any] = {}
-            if nk_col:
-                table = info["table_obj"]
-                pk_cols = info["pk_cols"]
-                if len(pk_cols) != 1:
+                    pk_col = pk_cols[0].name
+                    sel = select(table.c[nk_col], table.c[pk_col])
+                    for nk_val, pk_val in connection.execute(sel).fetchall():
+                        cache[nk_val] = pk_val
+                else:
                     raise ValueError(
-                        f"Table {tbl_name} has {len(pk_cols)} primary key columns; only single-column PKs are supported"
+                        f"Warning: Table {tbl_name} has 1:n relation but no natural-key column defined"
                     )
+                info["cache"] = cache
+
+        # A last 1:1 table that no other table references never needs its new
+        # PK mid-row, so its inserts are queued and sent in executemany batches.
+        # Rows that also insert elsewhere (e.g. a new parent) insert it
+        # directly instead, keeping the whole row in its savepoint; being last,
+        # a deferred insert that fails blocks no other table.
+        referenced = {
+            fk.column.table.name
+            for info in lookup.values()
+            for col in info["table_obj"].columns
+            for fk in col.foreign_keys
+        }
+        pending: Dict[str, List[Tuple[int, Dict[str, Any]]]] = {
+            tbl_name: []
+            for tbl_name in table_order[-1:]
+            if lookup[tbl_name]["traits"].relation_to_raw == "1:1"
+            and tbl_name not in referenced
+        }
 
-                pk_col = pk_cols[0].name
-                sel = select(table.c[nk_col], table.c[pk_col])
-                for nk_val, pk_val in tmp_connection.execute(sel).fetchall():
-                    cache[nk_val] = pk_val
-            else:
-                raise ValueError(
-                    f"Warning: Table {tbl_name} has 1:n relation but no natural-key column defined"
-                )
-            info["cache"] = cache
-
-    # Step 3: Insert Rows
-    for idx, (_, row) in enumerate(dataframe.iterrows()):
-        with engine.begin() as connection:
-            row_data = row.to_dict()
-            per_row_pk_memory: Dict[str, Any] = (
-                {}
-            )  # saves newly generated PKs for this row
-
-            for tbl_name in table_order:
-                info = lookup[tbl_name]
-                traits = info["traits"]
-                stats = info["stats"]
-                stats["attempt"] += 1
-
-                # gather insert_data ------------------------------------------------
-                insert_data: Dict[str, Any] = {}
-                # Get the names of primary key columns for the current table
-                pk_col_names = {pk_col.name for pk_col in info["pk_cols"]}
-
-                for db_col_name, csv_column_name_or_none in info["col_map"].items():
-                    if csv_column_name_or_none is None:
-                        # This db_col_name is not directly mapped from a CSV column.
-                        # Check if it is one of the primary key columns.
-                        if db_col_name in pk_col_names:
-                            # If it's a PK and not from CSV, it's a surrogate key.
-                            # Omit it from insert_data; the database will generate its value.
-                            continue
-                        else:
-                            # It's not a PK, but also not from CSV (e.g., an FK placeholder).
-                            # Set its value to None in insert_data for now.
-                            insert_data[db_col_name] = None
-                    else:
-                        # This db_col_name is mapped from a CSV column (csv_column_name_or_none).
-                        insert_data[db_col_name] = row_data.get(csv_column_name_or_none)
-
-                # resolve FKs from previously inserted parents ---------------------
-                for col in info["table_obj"].columns:
-                    if col.foreign_keys:
-                        parent_tbl = list(col.foreign_keys)[0].column.table.name
-                        if parent_tbl in per_row_pk_memory:
-                            insert_data[col.name] = per_row_pk_memory[parent_tbl]
+        # On PostgreSQL, 1:n inserts fold the lookup into the insert itself
+        use_on_conflict = engine.dialect.name == "postgresql"
+
+        # Step 3: Insert Rows
+        # Rows share one transaction per _ROWS_PER_TRANSACTION rows; each row runs
+        # in its own savepoint so a failure rewinds just that row, atomically.
+        # Bare tuples avoid building a Series per row (and keep ints as ints);
+        # values are read by position.
+        col_pos = {col: i for i, col in enumerate(dataframe.columns)}
+        for info in lookup.values():
+            info["insert_positions"] = [
+                (db_col, None if csv_col is None else col_pos[csv_col])
+                for db_col, csv_col in info["insert_cols"]
+            ]
+        transaction = _begin_load_transaction(connection)
+        for idx, row in enumerate(dataframe.itertuples(index=False, name=None)):
+            _retry_transient(
+                _insert_row,
+                connection,
+                lookup,
+                table_order,
+                pending,
+                row,
+                idx,
+                use_on_conflict,
+            )
 
-                # 1:n handling ------------------------------------------------------
-                if traits.relation_to_raw == "1:n":
-                    nk_col = info["natural_key_col"]
-                    nk_val = insert_data[nk_col]
-                    if nk_val is None:
-                        logger.warning(
-                            f"Row {idx}: missing natural‑key value for table {tbl_name}; dropped"
-                        )
-                        info["stats"]["dropped"] += 1
-                        continue
-
-                    cache = info["cache"]
-                    if nk_val in cache:
-                        # row already exists – reuse PK and store for dependents
-                        per_row_pk_memory[tbl_name] = cache[nk_val]
-                        continue  # nothing to insert
-
-                # attempt insert ----------------------------------------------------
-                try:
-                    result = connection.execute(
-                        info["table_obj"].insert().values(**insert_data)
-                    )
-                    if traits.relation_to_raw == "1:n":
-                        if (
-                            result.inserted_primary_key
-                            and len(result.inserted_primary_key) > 0
-                        ):
-                            new_pk = result.inserted_primary_key[0]
-                            cache[nk_val] = new_pk
-                            per_row_pk_memory[tbl_name] = new_pk
-                        else:
-                            # Handle case where inserted_primary_key is None or empty,
-                            raise ValueError(
-                                f"Row {idx}: Could not retrieve primary key after inserting into 1:n table {tbl_name}."
-                            )
-                    elif (
-                        result.inserted_primary_key
-                        and len(result.inserted_primary_key) > 0
-                    ):
-                        per_row_pk_memory[tbl_name] = result.inserted_primary_key[0]
-                except (exc.IntegrityError, exc.DataError) as e:
-                    err_msg = str(e.orig)
-                    parent_key = _classify_error(err_msg)
-
-                    def _record(tbl_info, key, msg, is_block=False):
-                        s = tbl_info["stats"]
-                        # If this was a *blocked* table it never reached the
-                        # "attempt += 1" line, so compensate here.
-                        if is_block:
-                            s["attempt"] += 1
-                        s["dropped"] += 1
-                        bucket = s["errors"].setdefault(key, {"count": 0, "sample": []})
-                        bucket["count"] += 1
-                        if len(bucket["sample"]) < 3:
-                            bucket["sample"].append(
-                                {
-                                    "row_idx": idx,
-                                    "data_excerpt": str(insert_data)[:200],
-                                    "msg": msg[:300],
-                                }
-                            )
-
-                    # record parent failure
-                    _record(info, parent_key, err_msg)
-
-                    # since all tables after this one are blocked, we record the failure for all of them
-                    for dep_tbl in table_order[table_order.index(tbl_name) + 1 :]:
-                        dep_info = lookup[dep_tbl]
-                        blocked_key = f"blocked-by-{tbl_name}"
-                        _record(
-                            dep_info,
-                            blocked_key,
-                            f"blocked because {tbl_name} failed ({parent_key})",
-                            is_block=True,
-                        )
+            _flush_deferred(connection, lookup, pending, min_size=_INSERT_BATCH_SIZE)
+            if (idx + 1) % _ROWS_PER_TRANSACTION == 0:
+                transaction.commit()
+                transaction = _begin_load_transaction(connection)
 
-                    logger.warning(
-                        f"Row {idx}: {parent_key} inserting into {tbl_name}: "
-                        f"{err_msg}; dropped and blocked dependants"
-                    )
-                    break
+        _flush_deferred(connection, lookup, pending)
+        transaction.commit()
 
     return lookup
@@ -1,10 +1,23 @@
+import logging
 from typing import List, Dict, Any
 import pandas as pd
-from sqlalchemy import text
+from sqlalchemy import bindparam, text
 from sqlalchemy.engine import Engine
 
 from vulcan.utils.llm_helpers import TableTraitsWithName
 
+logger = logging.getLogger(__name__)
+
+# Built once at import; one round trip covers every (table, column) pair.
+_SURROGATE_PK_COLUMNS_QUERY = text(
+    """
+    SELECT table_name, column_name, column_default, is_identity, identity_generation
+    FROM information_schema.columns
+    WHERE table_schema = 'public'  -- Assuming public schema for now
+      AND (table_name, column_name) IN :pairs;
+    """
+).bindparams(bindparam("pairs", expanding=True))
+
 
 def _validate_one_to_n_surrogate_pk_auto_increment(
     engine: Engine, table_traits: List[TableTraitsWithName]
@@ -20,48 +33,40 @@ def _validate_one_to_n_surrogate_pk_auto_increment(
     Raises:
         ValueError: If a 1:n table's surrogate PK is not auto-incrementing.
     """
+    pairs = [
+        (trait.name, trait.one_to_n.surrogate_pk_col)
+        for trait in table_traits
+        if trait.relation_to_raw == "1:n" and trait.one_to_n
+    ]
+    if not pairs:
+        return
+
     with engine.connect() as connection:
-        for trait in table_traits:
-            if trait.relation_to_raw == "1:n" and trait.one_to_n:
-                table_name = trait.name
-                surrogate_pk_col = trait.one_to_n.surrogate_pk_col
-
-                query = text(
-                    """
-                    SELECT column_name, column_default, is_identity, identity_generation
-                    FROM information_schema.columns
-                    WHERE table_schema = 'public'  -- Assuming public schema for now
-                      AND table_name   = :table_name
-                      AND column_name  = :column_name;
-                    """
-                )
-                result = connection.execute(
-                    query,
-                    {"table_name": table_name, "column_name": surrogate_pk_col},
-                )
-                column_info = result.fetchone()
-
-                if not column_info:
-                    raise ValueError(
-                        f"Configuration error for 1:n table '{table_name}': "
-                        f"Surrogate PK column '{surrogate_pk_col}' not found in the database schema."
-                    )
-
-                col_default = column_info[1]  # column_default
-                is_identity = column_info[2]  # is_identity
-
-                is_serial = (
-                    col_default is not None and "nextval" in str(col_default).lower()
-                )
-                is_identity_col = str(is_identity).upper() == "YES"
-
-                if not (is_serial or is_identity_col):
-                    raise ValueError(
-                        f"Validation Error for 1:n table '{table_name}': "
-                        f"Surrogate PK column '{surrogate_pk_col}' is not configured for auto-increment. "
-                        f"Details: column_default='{col_default}', is_identity='{is_identity}'"
-                    )
-                print(f"Validated auto-increment for {table_name}.{surrogate_pk_col}")
+        result = connection.execute(_SURROGATE_PK_COLUMNS_QUERY, {"pairs": pairs})
+        columns_info = {(row[0], row[1]): row for row in result}
+
+    for table_name, surrogate_pk_col in pairs:
+        column_info = columns_info.get((table_name, surrogate_pk_col))
+
+        if not column_info:
+            raise ValueError(
+                f"Configuration error for 1:n table '{table_name}': "
+                f"Surrogate PK column '{surrogate_pk_col}' not found in the database schema."
+            )
+
+        col_default = column_info[2]  # column_default
+        is_identity = column_info[3]  # is_identity
+
+        is_serial = col_default is not None and "nextval" in str(col_default).lower()
+        is_identity_col = str(is_identity).upper() == "YES"
+
+        if not (is_serial or is_identity_col):
+            raise ValueError(
+                f"Validation Error for 1:n table '{table_name}': "
+                f"Surrogate PK column '{surrogate_pk_col}' is not configured for auto-increment. "
+                f"Details: column_default='{col_default}', is_identity='{is_identity}'"
+            )
+        logger.debug("Validated auto-increment for %s.%s", table_name, surrogate_pk_col)
 
 
 def validate_content(
@@ -84,7 +89,7 @@ def validate_content(
     Raises:
         ValueError: If any validation fails.
     """
-    print("Starting content validation...")
+    logger.debug("Starting content validation...")
 
     # Validate single table constraint if flag is true
     if single_table and len(table_order) > 1:
@@ -97,4 +102,4 @@ def validate_content(
 
     # Future validation helper calls can be added here
 
-    print("Content validation completed successfully.")
+    logger.debug("Content validation completed successfully.")
@@ -1,5 +1,4 @@
-from io import StringIO
-
+import numpy as np
 import pandas as pd
 
 
@@ -13,44 +12,53 @@ def get_dataframe_description(dataframe: pd.DataFrame) -> str:
     Returns:
     - A formatted string with the description of DataFrame.
     """
-    # Capture the DataFrame info in a string buffer
-    buffer = StringIO()
-    dataframe.info(buf=buffer)
-    info = buffer.getvalue()
-    buffer.close()
-
-    # Extract and format the column information
-    lines = info.split("\n")
-    column_info_lines = [line for line in lines if line.strip()]
-    # Prepare the formatted output
+    # Read counts and dtypes directly rather than parsing df.info() output,
+    # which split names containing spaces and lost the counts
+    non_null_counts = dataframe.count()
     formatted_output = "Column             Non-Null             Dtype\n"
     formatted_output += "-" * 40 + "\n"
-    for line in column_info_lines[4:]:
-        try:
-            parts = line.strip().split()
-            column_name = parts[1]
-            non_null_count = parts[3]
-            dtype = parts[4]
-            formatted_output += f"{column_name:20} {non_null_count:15} {dtype}\n"
-        except IndexError as _e:
-            continue
+    for column_name, non_null_count, dtype in zip(
+        dataframe.columns, non_null_counts, dataframe.dtypes
+    ):
+        formatted_output += f"{str(column_name):20} {non_null_count:<15} {dtype}\n"
     return formatted_output
 
 
-def get_dataframe_samples(dataframe: pd.DataFrame, sample_size: int = 10) -> str:
+def get_dataframe_samples(
+    dataframe: pd.DataFrame, sample_size: int = 10, max_cell_length: int = 80
+) -> str:
     """
     Returns a string representation of a sample from the DataFrame.
 
     Parameters:
     - dataframe: The DataFrame to sample from.
     - sample_size: The number of samples to return.
+    - max_cell_length: Longer text values are cut to this many characters.
 
     Returns:
     - A string representation of the DataFrame sample.
     """
     if not dataframe.empty:
         # Ensure the sample size does not exceed the number of available rows
-        sample = dataframe.sample(n=min(sample_size, len(dataframe)))
+        # A fixed seed keeps the prompt (and so the LLM's answer) stable across
+        # runs; choice() draws the row numbers without permuting every row.
+        rng = np.random.default_rng(0)
+        idx = rng.choice(
+            len(dataframe), size=min(sample_size, len(dataframe)), replace=False
+        )
+        sample = dataframe.iloc[idx]
+        # Long free-text cells cost prompt tokens without telling the model
+        # more about the column; shorten them a column at a time.
+        text_cols = sample.select_dtypes(include=["object", "string"]).columns
+        if len(text_cols):
+            sample = sample.copy()
+            for col in text_cols:
+                as_text = sample[col].astype("string")
+                too_long = (as_text.str.len() > max_cell_length).fillna(False)
+                if too_long.any():
+                    sample[col] = sample[col].mask(
+                        too_long, as_text.str.slice(0, max_cell_length) + "..."
+                    )
         # Return a string representation of the sample without the index
         return sample.to_string(index=False)
     else:
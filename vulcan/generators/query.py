@@ -1,11 +1,54 @@
+import hashlib
+import logging
+from dataclasses import dataclass
+from typing import List, Optional
+
 import vulcan.generators.metadata as vgm
+import vulcan.utils.api_helpers as vua
 import vulcan.utils.llm_helpers as vuo
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
+# Bump to invalidate cached schemas when nothing hashed below changes
+_GENERATION_CACHE_VERSION = 1
+
+
+@dataclass(slots=True)
+class GeneratedSchema:
+    """Everything produced by the generation chain for a single dataframe."""
+
+    raw_data: str
+    structure: str
+    single_table: bool
+    schema: str
+    table_list: List[str]
+    table_traits: List[vuo.TableTraitsWithName]
+    constrained_schema: str
+    queries: List[str]
+    load_stats: Optional[pd.DataFrame] = None  # filled in by run_pipeline
+
+
+def generation_fingerprint() -> str:
+    """
+    Hashes what, besides the dataframe, decides generate_sql_queries' output.
+
+    Covers the source of the generation modules (prompts, token caps, the
+    GeneratedSchema fields) and of the API helpers (default and fallback
+    models, truncation and parsing behaviour).
+    """
+    digest = hashlib.sha256(str(_GENERATION_CACHE_VERSION).encode())
+    for module_file in (__file__, vgm.__file__, vuo.__file__, vua.__file__):
+        with open(module_file, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
 
-def generate_sql_queries(dataframe: pd.DataFrame, single_table: bool):
+def generate_sql_queries(
+    dataframe: pd.DataFrame, single_table: bool
+) -> GeneratedSchema:
     info = vgm.get_dataframe_description(dataframe)
-    print(">> DATAFRAME DESCRIPTION", info)
+    logger.debug(">> DATAFRAME DESCRIPTION %s", info)
     samples = vgm.get_dataframe_samples(dataframe, 30)
     # print("DATAFRAME SAMPLES", samples)
     data = {
@@ -20,4 +63,13 @@ def generate_sql_queries(dataframe: pd.DataFrame, single_table: bool):
     data = vuo.generate_constraints(data)
     data = vuo.generate_sql_queries(data)
 
-    return data
+    return GeneratedSchema(
+        raw_data=data["raw_data"],
+        structure=data["structure"],
+        single_table=data["single_table"],
+        schema=data["schema"],
+        table_list=data["table_list"],
+        table_traits=data["table_traits"],
+        constrained_schema=data["constrained_schema"],
+        queries=data["queries"],
+    )
@@ -1,5 +1,5 @@
 from collections import deque
-from typing import List, Dict, Set, Deque
+from typing import List, Dict, Set, Deque, Tuple
 
 from vulcan.utils.llm_helpers import TableTraitsWithName, DependencyDetail
 
@@ -35,20 +35,19 @@ def determine_table_creation_order(
                 "Cannot determine creation order without dependency information."
             )
 
-    adj: Dict[str, Set[str]] = {}  # Graph: Parent -> Set of children (dependents)
-    in_degree: Dict[str, int] = {}  # In-degree for each table (child)
-
-    # Accumulate all unique table names from traits (both table.name and dependencies.parent_table_name)
-    # These are all the nodes that will be part of our dependency graph.
-    all_potential_nodes: Set[str] = set()
+    # Nodes get integer ids in first-seen order (table names before their
+    # parents' names, trait by trait), which also fixes the output order.
+    name_to_id: Dict[str, int] = {}
+    names: List[str] = []
     for traits in table_traits_list:
-        all_potential_nodes.add(traits.name)
-        adj.setdefault(traits.name, set())
-        in_degree.setdefault(traits.name, 0)
-        for dep in traits.dependencies:
-            all_potential_nodes.add(dep.parent_table_name)
-            adj.setdefault(dep.parent_table_name, set())
-            in_degree.setdefault(dep.parent_table_name, 0)
+        for table_name in (
+            traits.name,
+            *(dep.parent_table_name for dep in traits.dependencies),
+        ):
+            if table_name not in name_to_id:
+                name_to_id[table_name] = len(names)
+                names.append(table_name)
+    all_potential_nodes: Set[str] = set(name_to_id)
 
     # Verify that the universe of tables from traits matches initial_table_list
     expected_tables_set = set(initial_table_list)
@@ -75,36 +74,39 @@ def determine_table_creation_order(
     # Now, all_potential_nodes is the definitive set of tables to order,
     # and it's identical to expected_tables_set.
 
-    # Build the graph (adjacency list: parent -> children) and calculate in-degrees
+    # Build the graph (adjacency list: parent id -> child ids, in traits order)
+    # and calculate in-degrees
+    n = len(names)
+    adj: List[List[int]] = [[] for _ in range(n)]
+    in_degree: List[int] = [0] * n
+    edges: Set[Tuple[int, int]] = set()
     for traits in table_traits_list:
         # traits.name is the child table in the context of its dependencies
-        child_table = traits.name
+        child_id = name_to_id[traits.name]
         for dep in traits.dependencies:
-            parent_table = dep.parent_table_name
+            edge = (name_to_id[dep.parent_table_name], child_id)
 
             # Add edge from parent to child if not already present
-            if child_table not in adj[parent_table]:
-                adj[parent_table].add(child_table)
-                in_degree[child_table] += 1
+            if edge not in edges:
+                edges.add(edge)
+                adj[edge[0]].append(child_id)
+                in_degree[child_id] += 1
 
     # Topological sort (Kahn's algorithm)
     # Initialize queue with all tables that have an in-degree of 0 (no prerequisites)
-    queue: Deque[str] = deque()
-    for table_name in all_potential_nodes:  # Iterate over the consistent set of tables
-        if in_degree[table_name] == 0:
-            queue.append(table_name)
+    queue: Deque[int] = deque(i for i in range(n) if in_degree[i] == 0)
 
     creation_order: List[str] = []
     while queue:
-        current_table = queue.popleft()
-        creation_order.append(current_table)
-
-        # For each child (dependent_table) of the current_table
-        # Sort children for deterministic output if multiple orders are possible
-        for dependent_table in sorted(list(adj.get(current_table, set()))):
-            in_degree[dependent_table] -= 1
-            if in_degree[dependent_table] == 0:
-                queue.append(dependent_table)
+        current_id = queue.popleft()
+        creation_order.append(names[current_id])
+
+        # Children are visited in the order their traits were listed, so the
+        # output is deterministic without sorting
+        for dependent_id in adj[current_id]:
+            in_degree[dependent_id] -= 1
+            if in_degree[dependent_id] == 0:
+                queue.append(dependent_id)
 
     # Verification: Check for cycles
     # If a cycle exists, not all tables will be in creation_order.
@@ -1,15 +1,24 @@
-from collections import deque
+from collections import Counter, deque
+from typing import Optional
 
 from vulcan.parsers.query import parse_sql_query
 
 
-def create_query_dependent_graph(queries: list):
-    tables = {}
+def build_tables_dict(queries: list, parsed: Optional[list] = None) -> dict:
+    """Map each table name to its parsed query info, without building the graph.
+
+    ``parsed`` may hold the parse_sql_query results for ``queries`` when the
+    caller already has them, in which case nothing is parsed again.
+    """
+    if parsed is None:
+        parsed = [parse_sql_query(query) for query in queries]
+    return {table_info["name"]: table_info for table_info in parsed}
+
+
+def create_query_dependent_graph(queries: list, parsed: Optional[list] = None):
+    tables = build_tables_dict(queries, parsed)
     dependency_graph = {}
-    for query in queries:
-        table_info = parse_sql_query(query)
-        table_name = table_info["name"]
-        tables[table_name] = table_info
+    for table_name, table_info in tables.items():
         dependency_graph.setdefault(table_name, [])
         for fk_table in table_info["foreign_keys"]:
             dependency_graph.setdefault(fk_table, []).append(table_name)
@@ -17,29 +26,49 @@ def create_query_dependent_graph(queries: list):
     return dependency_graph, tables
 
 
+def _to_csr(graph):
+    """
+    Flattens a {node: [dependents]} graph into compressed sparse rows.
+
+    Returns (names, offsets, edges, in_degree): node i's dependents are the
+    ids edges[offsets[i]:offsets[i + 1]], and in_degree[i] counts its parents.
+    """
+    names = list(graph)
+    name_to_id = {name: i for i, name in enumerate(names)}
+    offsets = [0]
+    edges = []
+    for u in names:
+        edges.extend(map(name_to_id.__getitem__, graph[u]))
+        offsets.append(len(edges))
+    # Counter tallies the whole edge list in C; sources default to 0
+    edge_counts = Counter(edges)
+    in_degree = [edge_counts[i] for i in range(len(names))]
+    return names, offsets, edges, in_degree
+
+
 def get_table_creation_order(graph):
-    # Count of incoming edges for each vertex
-    in_degree = {u: 0 for u in graph}
-    for u in graph:
-        for v in graph[u]:
-            in_degree[v] += 1
+    names, offsets, edges, in_degree = _to_csr(graph)
+    n = len(names)
+    processed = 0
 
     # Queue for vertices with no incoming edge
-    queue = deque([u for u in in_degree if in_degree[u] == 0])
+    queue = deque([u for u in range(n) if in_degree[u] == 0])
 
     # List to store the order of tables
     order = []
 
     while queue:
         vertex = queue.popleft()
-        order.append(vertex)
+        order.append(names[vertex])
+        processed += 1
 
-        for neighbor in graph[vertex]:
+        for k in range(offsets[vertex], offsets[vertex + 1]):
+            neighbor = edges[k]
             in_degree[neighbor] -= 1
             if in_degree[neighbor] == 0:
                 queue.append(neighbor)
 
-    if len(order) == len(in_degree):
-        return order
-    else:
+    # The queue ran dry with nodes left over: they all sit on or behind a cycle
+    if processed != n:
         raise Exception("Graph has at least one cycle, topological sort not possible.")
+    return order
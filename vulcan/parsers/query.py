@@ -1,7 +1,40 @@
+from functools import lru_cache
 from pglast import parse_sql
 from pglast.enums import ConstrType
 from pglast.ast import CreateStmt, ColumnDef, Constraint, RawStmt
-from typing import Any, Dict, List
+from typing import Any, Dict, List, NamedTuple, Sequence, Set, Tuple
+
+
+@lru_cache(maxsize=2048)
+def cached_parse_sql(query: str) -> Tuple[RawStmt, ...]:
+    """
+    Parses a SQL string with pglast, memoized by the query text.
+
+    The returned statements are shared between callers and must not be mutated.
+
+    Args:
+        query (str): The SQL text to parse.
+
+    Returns:
+        Tuple[RawStmt, ...]: The parsed SQL statements.
+    """
+    return parse_sql(query)
+
+
+class _CreateTableParts(NamedTuple):
+    """Everything the extract_* helpers read from one CREATE TABLE statement."""
+
+    column_defs: List[ColumnDef]
+    table_constraints: List[Constraint]
+    column_names: List[str]
+    foreign_tables: List[str]  # de-duplicated, in first-seen order
+
+
+def _create_stmt(parsed_query: Sequence[RawStmt]) -> CreateStmt:
+    create_stmt = parsed_query[0].stmt
+    if not isinstance(create_stmt, CreateStmt):
+        raise ValueError("Query is not a CREATE TABLE statement")
+    return create_stmt
 
 
 # TODO: Make sure references work with pg_last
@@ -15,14 +48,7 @@ def extract_columns_from_parsed_query(parsed_query: List[RawStmt]) -> List[Colum
     Returns:
         List[ColumnDef]: A list of column definitions.
     """
-    create_stmt = parsed_query[0].stmt
-    if not isinstance(create_stmt, CreateStmt):
-        raise ValueError("Query is not a CREATE TABLE statement")
-    columns = []
-    for column_def in create_stmt.tableElts:  # type: ignore
-        if isinstance(column_def, ColumnDef):
-            columns.append(column_def)
-    return columns
+    return _extract_all(_create_stmt(parsed_query)).column_defs
 
 
 # TODO: Make sure references work with pg_last
@@ -38,14 +64,7 @@ def extract_table_constraints_from_parsed_query(
     Returns:
         List[Constraint]: A list of table-level constraints.
     """
-    create_stmt = parsed_query[0].stmt
-    if not isinstance(create_stmt, CreateStmt):
-        raise ValueError("Query is not a CREATE TABLE statement")
-    constraints = []
-    for constraint in create_stmt.tableElts:  # type: ignore
-        if isinstance(constraint, Constraint):
-            constraints.append(constraint)
-    return constraints
+    return _extract_all(_create_stmt(parsed_query)).table_constraints
 
 
 def extract_column_names_from_parsed_query(parsed_query: List[RawStmt]) -> List[str]:
@@ -58,17 +77,10 @@ def extract_column_names_from_parsed_query(parsed_query: List[RawStmt]) -> List[
     Returns:
         list: A list of column names as strings.
     """
-    create_stmt = parsed_query[0].stmt
-    if not isinstance(create_stmt, CreateStmt):
-        raise ValueError("Query is not a CREATE TABLE statement")
-    columns = []
-    for column_def in create_stmt.tableElts:  # type: ignore
-        if isinstance(column_def, ColumnDef):
-            columns.append(column_def.colname)
-    return columns
+    return _extract_all(_create_stmt(parsed_query)).column_names
 
 
-def extract_foreign_keys_from_parsed_query(parsed_query: List[RawStmt]) -> List[str]:
+def extract_foreign_keys_from_parsed_query(parsed_query: List[RawStmt]) -> Set[str]:
     """
     Extracts all foreign key references from the parsed SQL query.
 
@@ -78,34 +90,9 @@ def extract_foreign_keys_from_parsed_query(parsed_query: List[RawStmt]) -> List[
         parsed_query (dict): A parsed SQL query dictionary.
 
     Returns:
-        list: A list of unique table names referenced by foreign key constraints.
+        set: The unique table names referenced by foreign key constraints.
     """
-    create_stmt = parsed_query[0].stmt
-    if not isinstance(create_stmt, CreateStmt):
-        raise ValueError("Query is not a CREATE TABLE statement")
-    foreign_tables = set()
-
-    # Column-level constraints
-    for column_def in create_stmt.tableElts:  # type: ignore
-        if isinstance(column_def, ColumnDef):
-            for constraint in column_def.constraints or []:
-                if (
-                    isinstance(constraint, Constraint)
-                    and constraint.contype == ConstrType.CONSTR_FOREIGN
-                ):
-                    fk_table = constraint.pktable.relname  # type: ignore
-                    foreign_tables.add(fk_table)
-
-    # Table-level constraints
-    for constraint in create_stmt.tableElts:  # type: ignore
-        if (
-            isinstance(constraint, Constraint)
-            and constraint.contype == ConstrType.CONSTR_FOREIGN
-        ):
-            fk_table = constraint.pktable.relname  # type: ignore
-            foreign_tables.add(fk_table)
-
-    return list(foreign_tables)
+    return set(_extract_all(_create_stmt(parsed_query)).foreign_tables)
 
 
 def parse_sql_query(query: str) -> Dict[str, Any]:
@@ -122,17 +109,53 @@ def parse_sql_query(query: str) -> Dict[str, Any]:
             - "columns": A list of column names in the table.
             - "foreign_keys": A list of tables referenced by foreign key constraints.
     """
-    parsed_statements = parse_sql(query)
-    create_stmt = parsed_statements[0].stmt
-
-    if not isinstance(create_stmt, CreateStmt):
-        raise ValueError("Query is not a CREATE TABLE statement")
-
-    table_name = create_stmt.relation.relname  # type: ignore
+    table_name, columns, foreign_keys = _parse_create_table(query)
 
+    # Fresh lists per call so callers can't corrupt the cached entry.
     return {
         "query": query,
         "name": table_name,
-        "columns": extract_column_names_from_parsed_query(parsed_statements),
-        "foreign_keys": extract_foreign_keys_from_parsed_query(parsed_statements),
+        "columns": list(columns),
+        "foreign_keys": list(foreign_keys),
     }
+
+
+@lru_cache(maxsize=2048)
+def _parse_create_table(query: str) -> Tuple[str, Tuple[str, ...], Tuple[str, ...]]:
+    create_stmt = _create_stmt(cached_parse_sql(query))
+    parts = _extract_all(create_stmt)
+
+    table_name = create_stmt.relation.relname  # type: ignore
+    return table_name, tuple(parts.column_names), tuple(parts.foreign_tables)
+
+
+def _extract_all(create_stmt: CreateStmt) -> _CreateTableParts:
+    """
+    Collects columns, table constraints and referenced tables in one pass over
+    tableElts. Every extract_* helper reads from this.
+    """
+    column_defs = []
+    table_constraints = []
+    foreign_tables: Dict[str, None] = {}
+    # pglast builds exactly these node classes (never subclasses), so exact
+    # type checks are safe and cheaper than isinstance in this loop
+    for element in create_stmt.tableElts or ():  # type: ignore
+        element_type = type(element)
+        if element_type is ColumnDef:
+            column_defs.append(element)
+            for constraint in element.constraints or ():
+                if (
+                    type(constraint) is Constraint
+                    and constraint.contype == ConstrType.CONSTR_FOREIGN
+                ):
+                    foreign_tables[constraint.pktable.relname] = None  # type: ignore
+        elif element_type is Constraint:
+            table_constraints.append(element)
+            if element.contype == ConstrType.CONSTR_FOREIGN:
+                foreign_tables[element.pktable.relname] = None  # type: ignore
+    return _CreateTableParts(
+        column_defs,
+        table_constraints,
+        [column_def.colname for column_def in column_defs],
+        list(foreign_tables),
+    )
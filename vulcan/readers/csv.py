@@ -1,3 +1,4 @@
+import importlib.util
 import re
 from typing import Optional
 
@@ -32,17 +33,23 @@ def clean_dataframe(dataframe: pd.DataFrame) -> pd.DataFrame:
     return dataframe
 
 
-def read_csv(csv_file_path: str, fillna: Optional[dict] = None) -> pd.DataFrame:
+def read_csv(
+    csv_file_path: str, fillna: Optional[dict] = None, engine: Optional[str] = None
+) -> pd.DataFrame:
     """Read a CSV file into a DataFrame, clean it, and optionally fill NaN values.
 
     Parameters:
     - csv_file_path: Path to the CSV file.
     - fillna: Dictionary specifying values to fill NaNs for specific columns, e.g., {'column_name': 0}.
+    - engine: Parser engine passed to pandas. "pyarrow" uses the multithreaded Arrow
+      parser (requires pyarrow, and infers date columns); defaults to pandas' C parser.
 
     Returns:
     - A cleaned DataFrame.
     """
-    dataframe = pd.read_csv(csv_file_path)
+    if engine == "pyarrow" and importlib.util.find_spec("pyarrow") is None:
+        raise ImportError("The 'pyarrow' CSV engine requires pyarrow to be installed.")
+    dataframe = pd.read_csv(csv_file_path, engine=engine)
     dataframe = clean_dataframe(dataframe)
     if fillna is not None:
         dataframe.fillna(value=fillna, inplace=True)
@@ -1,10 +1,25 @@
-from pglast import parse_sql
 from pglast.enums import ConstrType
 from pglast.ast import CreateStmt, ColumnDef, Constraint, RawStmt
 from typing import Dict, List
 
 import vulcan.parsers.query as vpq
 
+# Counter key per constraint kind; kinds missing from a map are not counted
+# at that level.
+_COLUMN_CONSTRAINT_KEYS = {
+    ConstrType.CONSTR_PRIMARY: "primary_key",
+    ConstrType.CONSTR_NOTNULL: "not_null",
+    ConstrType.CONSTR_UNIQUE: "unique",
+    ConstrType.CONSTR_DEFAULT: "default",
+    ConstrType.CONSTR_CHECK: "check",
+}
+_TABLE_CONSTRAINT_KEYS = {
+    ConstrType.CONSTR_FOREIGN: "foreign_key",
+    ConstrType.CONSTR_CHECK: "check",
+    ConstrType.CONSTR_UNIQUE: "unique",
+    ConstrType.CONSTR_PRIMARY: "primary_key",
+}
+
 
 def get_column_constraints(
     columns: List[ColumnDef], constraint_count: Dict[str, int]
@@ -13,16 +28,9 @@ def get_column_constraints(
     for column in columns:
         for constraint in column.constraints or []:
             if isinstance(constraint, Constraint):
-                if constraint.contype == ConstrType.CONSTR_PRIMARY:
-                    constraint_count["primary_key"] += 1
-                elif constraint.contype == ConstrType.CONSTR_NOTNULL:
-                    constraint_count["not_null"] += 1
-                elif constraint.contype == ConstrType.CONSTR_UNIQUE:
-                    constraint_count["unique"] += 1
-                elif constraint.contype == ConstrType.CONSTR_DEFAULT:
-                    constraint_count["default"] += 1
-                elif constraint.contype == ConstrType.CONSTR_CHECK:
-                    constraint_count["check"] += 1
+                key = _COLUMN_CONSTRAINT_KEYS.get(constraint.contype)
+                if key is not None:
+                    constraint_count[key] += 1
     return constraint_count
 
 
@@ -31,14 +39,9 @@ def get_table_constraints(
 ) -> Dict[str, int]:
     """Process table-level constraints from Constraint objects."""
     for constraint in constraints:
-        if constraint.contype == ConstrType.CONSTR_FOREIGN:
-            constraint_count["foreign_key"] += 1
-        elif constraint.contype == ConstrType.CONSTR_CHECK:
-            constraint_count["check"] += 1
-        elif constraint.contype == ConstrType.CONSTR_UNIQUE:
-            constraint_count["unique"] += 1
-        elif constraint.contype == ConstrType.CONSTR_PRIMARY:
-            constraint_count["primary_key"] += 1
+        key = _TABLE_CONSTRAINT_KEYS.get(constraint.contype)
+        if key is not None:
+            constraint_count[key] += 1
     return constraint_count
 
 
@@ -54,8 +57,8 @@ def count_constraints(sql_query):
         "default": 0,
     }
 
-    # Parse the SQL query into a JSON structure
-    parsed_statements = parse_sql(sql_query)
+    # Parse the SQL query (memoized; the AST is only read here)
+    parsed_statements = vpq.cached_parse_sql(sql_query)
 
     columns = vpq.extract_columns_from_parsed_query(parsed_statements)
     constraints = vpq.extract_table_constraints_from_parsed_query(parsed_statements)
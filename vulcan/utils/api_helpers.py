@@ -1,27 +1,217 @@
+import hashlib
+import json
 import os
-from openai import OpenAI
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List
+
 from dotenv import load_dotenv
+from pydantic import ValidationError
+
+from vulcan.utils.cache_helpers import (
+    LLM_CACHE_DIR,
+    evict_cached,
+    load_cached_json,
+    store_cached_json,
+)
+
+# Created on first use: importing openai is slow, and modules that only need
+# the pydantic models (loader, validator, tests) shouldn't require a key. The
+# key is read then too, so tests and callers can set it after import.
+_client = None
+# get_client is called from the trait-extraction threads; one client (and one
+# connection pool) is shared by all of them.
+_client_lock = threading.Lock()
+# Rate limits (429), timeouts, connection errors and 5xx responses are retried
+# by the SDK itself, with jittered exponential backoff that honours
+# Retry-After. Its default of 2 retries is too few to ride out a rate limit.
+_MAX_RETRIES = 5
+# Seconds per request; long schema/SQL answers can take a minute or more
+_REQUEST_TIMEOUT = 120.0
+
+
+def get_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                # Only runs once; a key already in the environment wins
+                load_dotenv()
+                api_key = os.getenv("OPENAI_API_KEY")
+                if not api_key:
+                    raise RuntimeError(
+                        "OPENAI_API_KEY is not set; add it to the environment or .env"
+                    )
+
+                import httpx
+                from openai import DefaultHttpxClient, OpenAI
+
+                _client = OpenAI(
+                    api_key=api_key,
+                    max_retries=_MAX_RETRIES,
+                    timeout=_REQUEST_TIMEOUT,
+                    # Keep enough warm connections for the concurrent trait calls
+                    http_client=DefaultHttpxClient(
+                        limits=httpx.Limits(
+                            max_keepalive_connections=20, max_connections=40
+                        )
+                    ),
+                )
+    return _client
 
-load_dotenv()
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=OPENAI_API_KEY)
+# Exact-match response cache for deterministic (temperature 0) requests. Keys
+# cover everything sent; structured answers are stored as plain dicts and
+# re-validated, so callers never share a model instance. Entries are kept in
+# memory and, when enabled, on disk as JSON so later runs skip the API too.
+_response_cache: Dict[str, Any] = {}
+# Off unless asked for (VULCAN_LLM_CACHE=1, or the CLI's --llm_cache)
+_disk_cache_enabled = os.getenv("VULCAN_LLM_CACHE") == "1"
+# Keys served or stored since clear_recent_responses, so a run whose output
+# turns out to be unusable can drop exactly the answers it was built from
+_recent_keys: List[str] = []
+
+
+def set_disk_cache(enabled: bool) -> None:
+    """Turns the on-disk response cache on or off for this process."""
+    global _disk_cache_enabled
+    _disk_cache_enabled = enabled
+
+
+def clear_recent_responses() -> None:
+    """Starts a new run for evict_recent_responses."""
+    _recent_keys.clear()
+
+
+def evict_recent_responses() -> None:
+    """
+    Drops every response served or stored since clear_recent_responses from
+    the memory and disk caches, so the next run asks the model again.
+    """
+    for key in _recent_keys:
+        _cache_evict(key)
+    _recent_keys.clear()
+
+
+def _cache_get(key: str):
+    value = _response_cache.get(key)
+    if value is None and _disk_cache_enabled:
+        value = load_cached_json(key, LLM_CACHE_DIR)
+        if value is not None:
+            _response_cache[key] = value
+    if value is not None:
+        _recent_keys.append(key)
+    return value
+
+
+def _cache_put(key: str, value) -> None:
+    _response_cache[key] = value
+    _recent_keys.append(key)
+    if _disk_cache_enabled:
+        store_cached_json(key, value, LLM_CACHE_DIR)
+
+
+def _cache_evict(key: str) -> None:
+    _response_cache.pop(key, None)
+    evict_cached(key, LLM_CACHE_DIR)
+
+
+@lru_cache(maxsize=None)
+def _response_format_fingerprint(response_format) -> str:
+    # The full JSON schema, not just the class name, so changing a model's
+    # fields never serves an answer shaped for the old ones
+    return json.dumps(response_format.model_json_schema(), sort_keys=True)
+
+
+def _cache_key(messages, model, temperature, seed, response_format, max_tokens) -> str:
+    payload = json.dumps(
+        [
+            messages,
+            model,
+            temperature,
+            seed,
+            (
+                _response_format_fingerprint(response_format)
+                if response_format
+                else None
+            ),
+            max_tokens,
+        ],
+        sort_keys=True,
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=32).hexdigest()
+
+
+def _length_limit(max_tokens) -> Dict[str, Any]:
+    # Only sent when set, so the API default (no cap) applies otherwise
+    return {} if max_tokens is None else {"max_tokens": max_tokens}
 
 
 def openai_chat_api_structured(
-    messages, *, model="gpt-4.1", temperature=0, seed=42, response_format=None
+    messages,
+    *,
+    model="gpt-4.1-nano",
+    temperature=0,
+    seed=42,
+    response_format=None,
+    fallback_model="gpt-4.1-mini",
+    max_tokens=None,
 ):
     """
     Similar to openai_chat_api, but enforces a structured output
     using the Beta OpenAI API features for structured JSON output.
+
+    Extraction runs on a small model by default; if it refuses, its output
+    doesn't validate, or the SDK gives up on it (length limit or content
+    filter), the request is retried once on ``fallback_model`` (pass None to
+    disable). ``max_tokens`` caps the length of the answer.
     """
+    key = None
+    if temperature == 0 and response_format is not None:
+        key = _cache_key(
+            messages, model, temperature, seed, response_format, max_tokens
+        )
+        cached = _cache_get(key)
+        if cached is not None:
+            try:
+                return response_format.model_validate(cached)
+            except ValidationError:  # written by an incompatible version
+                _cache_evict(key)
+
+    try:
+        parsed = _parse_structured(
+            messages, model, temperature, seed, response_format, max_tokens
+        )
+    except _fallback_errors():
+        if not fallback_model or fallback_model == model:
+            raise
+        parsed = _parse_structured(
+            messages, fallback_model, temperature, seed, response_format, max_tokens
+        )
+    if key is not None:
+        _cache_put(key, parsed.model_dump(mode="json"))
+    return parsed
+
+
+@lru_cache(maxsize=None)
+def _fallback_errors():
+    # Refusal, empty answer or pydantic ValidationError (all ValueError), and
+    # the answers parse() rejects itself. Transport errors are not included:
+    # the client already retried those.
+    from openai import ContentFilterFinishReasonError, LengthFinishReasonError
+
+    return (ValueError, LengthFinishReasonError, ContentFilterFinishReasonError)
+
+
+def _parse_structured(messages, model, temperature, seed, response_format, max_tokens):
     # enforces schema adherence with response_format
-    completion = client.beta.chat.completions.parse(
+    completion = get_client().beta.chat.completions.parse(
         messages=messages,
         model=model,
         temperature=temperature,
         seed=seed,
         response_format=response_format,  # type: ignore
+        **_length_limit(max_tokens),
     )
 
     structured_response = completion.choices[0].message
@@ -32,12 +222,47 @@ def openai_chat_api_structured(
         )
     elif structured_response.parsed:
         return structured_response.parsed
+    elif response_format is not None and structured_response.content:
+        # Validate the raw JSON straight into the model, no dict in between
+        return response_format.model_validate_json(structured_response.content)
     else:
         raise ValueError("No structured output or refusal was returned.")
 
 
-def openai_chat_api(messages, *, model="gpt-4o", temperature=0, seed=42):
-    response = client.chat.completions.create(
-        messages=messages, model=model, temperature=temperature, seed=seed
+def openai_chat_api(
+    messages, *, model="gpt-4o", temperature=0, seed=42, max_tokens=None
+):
+    key = None
+    if temperature == 0:
+        key = _cache_key(messages, model, temperature, seed, None, max_tokens)
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+
+    choice = _create_chat_completion(messages, model, temperature, seed, max_tokens)
+    if choice.finish_reason == "length" and max_tokens is not None:
+        # The cap cut the answer off; retry once with twice the room
+        choice = _create_chat_completion(
+            messages, model, temperature, seed, max_tokens * 2
+        )
+    if choice.finish_reason == "length":
+        # A schema or SQL answer cut off mid-statement must never be used,
+        # let alone cached
+        raise ValueError(
+            f"OpenAI answer from {model} was cut off by the output token limit."
+        )
+    content = choice.message.content
+    if key is not None and content is not None:
+        _cache_put(key, content)
+    return content
+
+
+def _create_chat_completion(messages, model, temperature, seed, max_tokens):
+    response = get_client().chat.completions.create(
+        messages=messages,
+        model=model,
+        temperature=temperature,
+        seed=seed,
+        **_length_limit(max_tokens),
     )
-    return response.choices[0].message.content
+    return response.choices[0]
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+import pandas as pd
+
+_CACHE_ROOT = os.path.join(
+    os.getenv("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "vulcan"
+)
+CACHE_DIR = os.path.join(_CACHE_ROOT, "queries")
+LLM_CACHE_DIR = os.path.join(_CACHE_ROOT, "llm")
+
+
+def dataframe_fingerprint(
+    dataframe: pd.DataFrame, single_table: bool, version: str = ""
+) -> str:
+    """
+    Builds a cache key from the contents of a dataframe.
+
+    Parameters:
+    - dataframe: The DataFrame the schema is generated from.
+    - single_table: Whether a single table schema was requested.
+    - version: Identifies the code and prompts that produce the cached value,
+      so entries from older versions are never reused.
+
+    Returns:
+    - SHA-256 hex digest of the columns, dtypes, every row, flag and version.
+    """
+    # The prompt samples rows from anywhere in the frame and counts non-nulls
+    # over all of it, so every row must be part of the key
+    rows = pd.util.hash_pandas_object(dataframe, index=False)
+    payload = {
+        "cols": list(dataframe.columns),
+        "dtypes": [str(t) for t in dataframe.dtypes],
+        "n": len(dataframe),
+        "rows": hashlib.sha256(rows.values.tobytes()).hexdigest(),
+        "single": single_table,
+        "version": version,
+    }
+    return hashlib.sha256(json.dumps(payload).encode()).hexdigest()
+
+
+def load_cached(key: str, cache_dir: str = CACHE_DIR):
+    """Returns the value cached under key, or None on a miss or unreadable entry."""
+    path = os.path.join(cache_dir, f"{key}.pkl")
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    # Entries pickled by older code can name moved classes or miss attributes
+    except (
+        OSError,
+        pickle.UnpicklingError,
+        EOFError,
+        AttributeError,
+        ImportError,
+        TypeError,
+    ):
+        return None
+
+
+def load_cached_json(key: str, cache_dir: str):
+    """Like load_cached, for values stored with store_cached_json."""
+    path = os.path.join(cache_dir, f"{key}.json")
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def evict_cached(key: str, cache_dir: str = CACHE_DIR) -> None:
+    """Removes the value cached under key, pickled or JSON, if any."""
+    for ext in (".pkl", ".json"):
+        try:
+            os.remove(os.path.join(cache_dir, key + ext))
+        except FileNotFoundError:
+            pass
+
+
+def store_cached(key: str, value, cache_dir: str = CACHE_DIR) -> None:
+    """Pickles value under key, replacing the file atomically."""
+    _write_atomic(os.path.join(cache_dir, f"{key}.pkl"), pickle.dumps(value))
+
+
+def store_cached_json(key: str, value, cache_dir: str) -> None:
+    """
+    Stores a JSON-serializable value under key, replacing the file atomically.
+
+    Unlike a pickle, loading the entry back can't run code, so this suits
+    caches whose values are plain data.
+    """
+    _write_atomic(
+        os.path.join(cache_dir, f"{key}.json"), json.dumps(value).encode("utf-8")
+    )
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    cache_dir = os.path.dirname(path)
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
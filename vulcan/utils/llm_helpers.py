@@ -1,14 +1,27 @@
 import json
+import logging
 import re
-from typing import Any, Dict, List, Type, Optional, Literal
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Type, Optional, Literal
 from datetime import datetime
 from pydantic import BaseModel, Field
 
 from vulcan.utils.api_helpers import openai_chat_api, openai_chat_api_structured
 
+logger = logging.getLogger(__name__)
 
-def generate_schema(data: dict) -> dict:
-    system_prompt = """
+# Concurrent per-table requests in generate_table_traits
+_MAX_TRAIT_WORKERS = 8
+
+# Upper bounds on answer length, well above what each step normally returns;
+# they stop a runaway generation rather than shape the answer.
+_PROSE_MAX_TOKENS = 4096  # schema, constrained schema
+_SQL_MAX_TOKENS = 8192
+_TABLE_LIST_MAX_TOKENS = 1024
+_TABLE_TRAITS_MAX_TOKENS = 1024  # per table
+
+
+_SCHEMA_SYSTEM_PROMPT = """
 ### Task ###
 Create a relational database schema from the raw data and structure provided by the user.
 
@@ -37,9 +50,20 @@ Create a relational database schema from the raw data and structure provided by
 12. When defining a 1:n table, its surrogate primary key (e.g., `employer_id`) MUST be described as auto-incrementing or sequentially generated by the database.
 13. Generally refrain from renaming columns from the raw data, but if you do, explain why.
 """
-    if data.get("single_table", False):
-        system_prompt += """
-14. The user has indicated that only a single table should be created for this database. Adhere strictly to this requirement. Do not create multiple tables."""
+
+
+_SINGLE_TABLE_INSTRUCTION = """### Additional Instruction ###
+The user has indicated that only a single table should be created for this database. Adhere strictly to this requirement. Do not create multiple tables.
+"""
+
+
+def generate_schema(data: dict) -> dict:
+    # The system prompt stays byte-identical across runs so its prefix can be
+    # served from the API's prompt cache; per-run instructions go to the user.
+    system_prompt = _SCHEMA_SYSTEM_PROMPT
+    single_table_note = (
+        _SINGLE_TABLE_INSTRUCTION if data.get("single_table", False) else ""
+    )
 
     user_prompt = f"""
 ### Input Data ###
@@ -88,14 +112,14 @@ paragraph explaining the table and its relationships with other tables and the r
 ### Raw Data Structure ###
 {data['structure']}
 
-
+{single_table_note}
 Output Schema:
 """
     messages = [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_prompt},
     ]
-    data["schema"] = openai_chat_api(messages)
+    data["schema"] = openai_chat_api(messages, max_tokens=_PROSE_MAX_TOKENS)
     print(">> GENERATED SCHEMA ", data["schema"])
     return data
 
@@ -106,11 +130,7 @@ class TableList(BaseModel):
     )
 
 
-def generate_table_list(data: dict) -> dict:
-    """
-    Generates a list of table names from the schema.
-    """
-    system_prompt = """
+_TABLE_LIST_SYSTEM_PROMPT = """
 ### Task ###
 Extract all table names from the provided database schema.
 
@@ -131,6 +151,13 @@ For example:
   "table_names": ["table_a", "table_b", "table_c"]
 }
 """
+
+
+def generate_table_list(data: dict) -> dict:
+    """
+    Generates a list of table names from the schema.
+    """
+    system_prompt = _TABLE_LIST_SYSTEM_PROMPT
     user_prompt = f"""
 ### Schema ###
 {data['schema']}
@@ -144,10 +171,10 @@ Output a JSON object containing the list of table names:
 
     table_list_response = openai_chat_api_structured(
         messages,
-        model="gpt-4.1",
         temperature=0,
         seed=42,
         response_format=TableList,
+        max_tokens=_TABLE_LIST_MAX_TOKENS,
     )
     data["table_list"] = table_list_response.table_names
     print(">> GENERATED TABLE LIST ", data["table_list"])
@@ -201,37 +228,8 @@ class TableTraitsWithName(SingleTableTraits):
     name: str = Field(description="Name of the table.")
 
 
-def generate_table_traits(data: dict) -> dict:
-    """
-    Generates detailed traits for each table in the schema.
-    For each table, it identifies its relation to raw data, column mappings (only for differing names),
-    1:n specific details (surrogate PK, natural keys), and dependencies.
-    """
-    schema_text = data.get("schema", "")
-    raw_data_structure = data.get(
-        "structure", ""
-    )  # Assuming 'structure' holds raw data structure
-    table_list = data.get("table_list", [])
-
-    if not schema_text or not raw_data_structure or not table_list:
-        print(
-            ">> SKIPPING TRAIT GENERATION: Missing schema, raw_data_structure, or table_list in data."
-        )
-        data["table_traits"] = []
-        return data
-
-    all_table_traits: List[TableTraitsWithName] = []
-
-    system_prompt = """
-### Task ###
-For a single database table, extract its structural traits based on the provided overall schema, raw data structure, and table name. The traits include its relationship to raw data, column mappings (only if names differ from CSV), details for 1:n relationships (surrogate PK, natural keys), and dependencies on other tables.
-
-### Input Data ###
-1.  `schema`: The complete relational schema description.
-2.  `raw_data_structure`: The structure of the source CSV/raw data (column names and types).
-3.  `table_name`: The specific table for which to extract traits.
-
-### Instructions for Trait Extraction ###
+# Shared by the per-table and the all-tables trait prompts
+_TRAIT_EXTRACTION_RULES = """### Instructions for Trait Extraction ###
 1.  **`relation_to_raw`**: Determine if the table has a "1:1" or "1:n" relationship with the raw data rows. This is typically found in the "Traits" section for the table in the schema.
     - Example "1:1": "Traits: - 1:1 correspondence with raw data rows"
     - Example "1:n": "Traits: - 1:N correspondence with raw data rows"
@@ -261,7 +259,21 @@ For a single database table, extract its structural traits based on the provided
     - Dependent on another 1:n table.
 - 1:N tables should have a surrogate primary key (e.g., `column_name_id`) and a natural key (e.g., `column_name`).
 
-### Output Format ###
+"""
+
+_TABLE_TRAITS_SYSTEM_PROMPT = (
+    """
+### Task ###
+For a single database table, extract its structural traits based on the provided overall schema, raw data structure, and table name. The traits include its relationship to raw data, column mappings (only if names differ from CSV), details for 1:n relationships (surrogate PK, natural keys), and dependencies on other tables.
+
+### Input Data ###
+1.  `schema`: The complete relational schema description.
+2.  `raw_data_structure`: The structure of the source CSV/raw data (column names and types).
+3.  `table_name`: The specific table for which to extract traits.
+
+"""
+    + _TRAIT_EXTRACTION_RULES
+    + """### Output Format ###
 Return a single JSON object strictly matching the following Pydantic model structure (do not include the model definition in the output, just the JSON data itself):
 ```python
 class SingleTableTraits(BaseModel):
@@ -272,15 +284,111 @@ class SingleTableTraits(BaseModel):
 ```
 Ensure `mapping` and `dependencies` are provided as empty lists if no such items exist. `one_to_n` MUST be provided if `relation_to_raw` is '1:n' and MUST be `null` (or omitted) if `relation_to_raw` is '1:1'.
 """
+)
+
+_ALL_TABLE_TRAITS_SYSTEM_PROMPT = (
+    """
+### Task ###
+For every database table in a list, extract its structural traits based on the provided overall schema, raw data structure, and table names. The traits include each table's relationship to raw data, column mappings (only if names differ from CSV), details for 1:n relationships (surrogate PK, natural keys), and dependencies on other tables.
+
+### Input Data ###
+1.  `schema`: The complete relational schema description.
+2.  `raw_data_structure`: The structure of the source CSV/raw data (column names and types).
+3.  `table_names`: The tables for which to extract traits.
+
+"""
+    + _TRAIT_EXTRACTION_RULES
+    + """### Output Format ###
+Return a single JSON object strictly matching the following Pydantic model structure (do not include the model definition in the output, just the JSON data itself):
+```python
+class AllTableTraits(BaseModel):
+    tables: List[TableTraitsWithName]
+
+class TableTraitsWithName(BaseModel):
+    name: str # exactly as given in `table_names`
+    relation_to_raw: Literal["1:1", "1:n"]
+    mapping: List[ColumnMappingDetail] # where ColumnMappingDetail is {"raw_csv_col": str, "table_col": str}
+    one_to_n: Optional[OneToNTraitDetail] # where OneToNTraitDetail is {"surrogate_pk_col": str, "natural_key_col": str}
+    dependencies: List[DependencyDetail] # where DependencyDetail is {"parent_table_name": str, "local_fk_col": str}
+```
+Return exactly one entry per table name, in the order given. Ensure `mapping` and `dependencies` are provided as empty lists if no such items exist. `one_to_n` MUST be provided if `relation_to_raw` is '1:n' and MUST be `null` (or omitted) if `relation_to_raw` is '1:1'.
+"""
+)
+
+
+class AllTableTraits(BaseModel):
+    tables: List[TableTraitsWithName] = Field(
+        description="Traits for every requested table, one entry per table name."
+    )
+
 
-    for table_name in table_list:
-        user_prompt = f"""
+def _generate_all_table_traits(
+    schema_text: str, raw_data_structure: str, table_list: List[str]
+) -> Optional[List[TableTraitsWithName]]:
+    """
+    Extracts the traits of every table with a single structured call.
+
+    Returns the traits in table_list order, or None if the call fails or does
+    not return exactly one entry per table.
+    """
+    user_prompt = f"""
 ### Schema ###
 {schema_text}
 
 ### Raw Data Structure ###
 {raw_data_structure}
 
+### Target Table Names ###
+{json.dumps(table_list)}
+
+Extract traits for each of these tables:
+"""
+    messages = [
+        {"role": "system", "content": _ALL_TABLE_TRAITS_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt},
+    ]
+
+    try:
+        response = openai_chat_api_structured(
+            messages,
+            temperature=0,
+            seed=42,
+            response_format=AllTableTraits,
+            max_tokens=_TABLE_TRAITS_MAX_TOKENS * len(table_list),
+        )
+    except Exception as e:
+        print(f">> ERROR generating traits for all tables at once: {e}")
+        return None
+
+    traits_by_name = {traits.name: traits for traits in response.tables}
+    if len(response.tables) != len(table_list) or set(traits_by_name) != set(
+        table_list
+    ):
+        print(
+            ">> BATCHED TRAITS DID NOT MATCH THE TABLE LIST: "
+            f"{[traits.name for traits in response.tables]}"
+        )
+        return None
+    return [traits_by_name[table_name] for table_name in table_list]
+
+
+def _generate_table_traits_per_table(
+    schema_text: str, raw_data_structure: str, table_list: List[str]
+) -> List[TableTraitsWithName]:
+    """Extracts traits with one structured call per table, in table_list order."""
+    system_prompt = _TABLE_TRAITS_SYSTEM_PROMPT
+    # Built once: every table's prompt starts with the same schema block, and
+    # only the target table name differs.
+    user_prompt_prefix = f"""
+### Schema ###
+{schema_text}
+
+### Raw Data Structure ###
+{raw_data_structure}
+"""
+
+    def extract_traits(table_name: str) -> TableTraitsWithName:
+        user_prompt = user_prompt_prefix + f"""
 ### Target Table Name ###
 {table_name}
 
@@ -294,36 +402,86 @@ Extract traits for the table "{table_name}":
         try:
             table_traits_response = openai_chat_api_structured(
                 messages,
-                model="gpt-4.1",
                 temperature=0,
                 seed=42,
                 response_format=SingleTableTraits,
+                max_tokens=_TABLE_TRAITS_MAX_TOKENS,
             )
-            # Combine with table_name and append
+            # Combine with table_name
             full_traits = TableTraitsWithName(
                 name=table_name, **table_traits_response.model_dump()
             )
-            all_table_traits.append(full_traits)
             print(f">> GENERATED TRAITS FOR TABLE: {table_name}")
+            return full_traits
         except Exception as e:
             print(f">> ERROR generating traits for table {table_name}: {e}")
-            # Optionally, append a placeholder or skip
-            all_table_traits.append(
-                TableTraitsWithName(
-                    name=table_name, relation_to_raw="1:1", mapping=[], dependencies=[]
-                )
+            # Optionally, return a placeholder
+            return TableTraitsWithName(
+                name=table_name, relation_to_raw="1:1", mapping=[], dependencies=[]
             )  # Basic default
 
-    data["table_traits"] = all_table_traits
-    print(
-        ">> ALL TABLE TRAITS GENERATED: ",
-        [trait.model_dump_json(indent=2) for trait in all_table_traits],
+    # The per-table calls are independent and network-bound, so they run
+    # concurrently; map() keeps the results in table_list order.
+    with ThreadPoolExecutor(max_workers=_MAX_TRAIT_WORKERS) as executor:
+        all_table_traits: List[TableTraitsWithName] = list(
+            executor.map(extract_traits, table_list)
+        )
+    return all_table_traits
+
+
+def table_traits_json(table_traits_list: list) -> str:
+    """Render traits (pydantic models or plain dicts) as one indented JSON array."""
+    return json.dumps(
+        [
+            trait.model_dump(mode="json") if isinstance(trait, BaseModel) else trait
+            for trait in table_traits_list
+        ],
+        indent=2,
+    )
+
+
+def generate_table_traits(data: dict) -> dict:
+    """
+    Generates detailed traits for each table in the schema.
+    For each table, it identifies its relation to raw data, column mappings (only for differing names),
+    1:n specific details (surrogate PK, natural keys), and dependencies.
+    """
+    schema_text = data.get("schema", "")
+    raw_data_structure = data.get(
+        "structure", ""
+    )  # Assuming 'structure' holds raw data structure
+    table_list = data.get("table_list", [])
+
+    if not schema_text or not raw_data_structure or not table_list:
+        print(
+            ">> SKIPPING TRAIT GENERATION: Missing schema, raw_data_structure, or table_list in data."
+        )
+        data["table_traits"] = []
+        data["table_traits_json"] = "[]"
+        return data
+
+    # One call for all tables; per-table calls only if that answer is unusable
+    all_table_traits = _generate_all_table_traits(
+        schema_text, raw_data_structure, table_list
     )
+    if all_table_traits is None:
+        all_table_traits = _generate_table_traits_per_table(
+            schema_text, raw_data_structure, table_list
+        )
+    else:
+        print(f">> GENERATED TRAITS FOR TABLES: {', '.join(table_list)}")
+
+    data["table_traits"] = all_table_traits
+    data["table_traits_json"] = table_traits_json(all_table_traits)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            ">> ALL TABLE TRAITS GENERATED: %s",
+            [trait.model_dump_json(indent=2) for trait in all_table_traits],
+        )
     return data
 
 
-def generate_constraints(data: dict) -> dict:
-    system_prompt = f"""
+_CONSTRAINTS_SYSTEM_PROMPT = """
 ### Task ###
 Identify constraints in the relational database schema provided by the user.
 
@@ -348,6 +506,10 @@ Identify constraints in the relational database schema provided by the user.
 ## Desired Output ###
 constrainted schema: A relational schema consisting of all applicable constraints. 
 """
+
+
+def generate_constraints(data: dict) -> dict:
+    system_prompt = _CONSTRAINTS_SYSTEM_PROMPT
     user_prompt = f"""
 ### Raw Data Sample ###
 {data['raw_data']}
@@ -365,13 +527,12 @@ Constrained Schema:
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_prompt},
     ]
-    data["constrained_schema"] = openai_chat_api(messages)
+    data["constrained_schema"] = openai_chat_api(messages, max_tokens=_PROSE_MAX_TOKENS)
     print(">> GENERATED CONSTRAINTS ", data["constrained_schema"])
     return data
 
 
-def generate_sql_queries(data: dict) -> dict:
-    system_prompt = f"""
+_SQL_QUERIES_SYSTEM_PROMPT = """
 ### Task ###
 Generate syntactically correct CREATE TABLE queries for the constrained schema provided by the user, specifically for PostGreSQL.
 
@@ -399,19 +560,15 @@ Generate syntactically correct CREATE TABLE queries for the constrained schema p
 2. Ensure all columns designated as `UNIQUE` or part of a natural key in the `Constrained Schema` have `UNIQUE` constraints (and `NOT NULL` if appropriate, especially for natural keys).
 """
 
-    table_traits_list = data.get("table_traits", [])
-    # Ensure table_traits_list is a list of objects that have model_dump_json if it's not empty
-    if table_traits_list and hasattr(table_traits_list[0], "model_dump_json"):
-        table_traits_json_list = [
-            trait.model_dump_json(indent=2) for trait in table_traits_list
-        ]
-        table_traits_prompt_string = (
-            "[\\n" + ",\\n".join(table_traits_json_list) + "\\n]"
-        )
-    elif table_traits_list:  # If it's already dicts/simple structures
-        table_traits_prompt_string = json.dumps(table_traits_list, indent=2)
-    else:
-        table_traits_prompt_string = "[]"
+
+def generate_sql_queries(data: dict) -> dict:
+    system_prompt = _SQL_QUERIES_SYSTEM_PROMPT
+
+    # Serialized once by generate_table_traits; rebuilt only when the traits
+    # were supplied some other way
+    table_traits_prompt_string = data.get("table_traits_json") or table_traits_json(
+        data.get("table_traits", [])
+    )
 
     user_prompt = f"""
 ### Constrained Schema ###
@@ -429,18 +586,34 @@ SQL Queries for PostGreSQL:
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": user_prompt},
     ]
-    queries = openai_chat_api(messages)
-    data["queries"] = format_sql_queries(queries)  # type: ignore
+    queries = openai_chat_api(messages, max_tokens=_SQL_MAX_TOKENS)
+    # Materialized: the queries are indexed, re-read and cached downstream
+    data["queries"] = list(format_sql_queries(queries))  # type: ignore
     print(">> GENERATED QUERIES ", data["queries"])
     return data
 
 
-def format_sql_queries(queries: str) -> list:
-    # Remove the initial ```sql and the final ```
-    cleaned_queries = re.sub(
-        r"^\s*```sql\s*|\s*```\s*$", "", queries, flags=re.MULTILINE
-    )
-    # Split the queries by the start of each "CREATE TABLE", using lookahead to keep "CREATE TABLE" with each split
-    split_queries = re.split(r"(?=\s*CREATE TABLE)", cleaned_queries.strip())
-    # Clean up any leading/trailing whitespace and return the list
-    return [query.strip() for query in split_queries if query.strip()]
+# Code fences around the model's SQL answer, stripped by format_sql_queries
+_FENCE_RE = re.compile(r"^\s*```sql\s*|\s*```\s*$", re.MULTILINE)
+
+
+def format_sql_queries(queries: str) -> Iterator[str]:
+    """Yield the CREATE TABLE statements of a model answer, one at a time."""
+    # Remove the initial ```sql and the final ```; unfenced answers skip the regex
+    if "```" in queries:
+        queries = _FENCE_RE.sub("", queries)
+    cleaned_queries = queries.strip()
+    # Split the queries at the start of each "CREATE TABLE", keeping "CREATE TABLE"
+    # with each piece; a single str.find scan, no regex lookahead
+    start = 0
+    while True:
+        end = cleaned_queries.find("CREATE TABLE", start + 1)
+        # Clean up any leading/trailing whitespace, skipping empty pieces
+        query = (
+            cleaned_queries[start:] if end == -1 else cleaned_queries[start:end]
+        ).strip()
+        if query:
+            yield query
+        if end == -1:
+            return
+        start = end